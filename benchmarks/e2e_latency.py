@@ -0,0 +1,310 @@
+"""
+End-to-end dictation latency benchmark.
+
+Runs the real VoiceRecorder -> TranscriptionService -> paste path without a
+microphone, network or display: a fake `sounddevice` module plays synthetic
+speech into the recorder, and the OpenAI client talks to a local stand-in for
+the Whisper API with configurable latency, jitter and bandwidth.
+
+Reports release-to-text latency (p50/p95/p99) per clip length, with the
+per-stage breakdown from speech_to_text.latency, CPU time and peak RSS.
+
+Run from the repository root:
+    python benchmarks/e2e_latency.py
+    python benchmarks/e2e_latency.py --clips 5 30 --runs 50 --latency 0.3 --jitter 0.1
+    python benchmarks/e2e_latency.py --streaming --speed 1
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from scipy.signal import resample_poly
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_RATE = 16000
+BLOCK_FRAMES = 512
+
+def synthetic_speech(seconds, sample_rate=SAMPLE_RATE, seed=0):
+    """Return float32 mono audio of voiced bursts separated by short and long pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    audio = rng.normal(0, 0.002, total).astype(np.float32)
+
+    position = int(0.3 * sample_rate)
+    while position < total:
+        burst = int(rng.uniform(0.6, 1.6) * sample_rate)
+        t = np.arange(min(burst, total - position)) / sample_rate
+        pitch = rng.uniform(100, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)  # syllable rate
+        audio[position:position + len(t)] += (0.08 * voiced * envelope).astype(np.float32)
+        # Mostly short gaps between words, sometimes a pause long enough to end a segment
+        position += burst + int((0.8 if rng.random() < 0.3 else 0.2) * sample_rate)
+    return np.clip(audio, -1, 1)
+
+class FakeInputStream:
+    """Stands in for sounddevice.InputStream, playing a clip into the callback."""
+
+    source = None
+    speed = 10.0
+    device_rate = SAMPLE_RATE
+    device_channels = 1
+    finished = threading.Event()
+
+    def __init__(self, samplerate, channels, dtype, callback, device=None, **kwargs):
+        """Remember the callback; audio starts flowing on start()."""
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = dtype
+        self.callback = callback
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Feed the current source in fixed blocks, paced at `speed` times real time."""
+        FakeInputStream.finished.clear()
+        self.thread = threading.Thread(target=self._feed, daemon=True)
+        self.thread.start()
+
+    def _feed(self):
+        """Deliver blocks like PortAudio would, from a dedicated thread."""
+        source = FakeInputStream.source.reshape(-1, 1)
+        if self.samplerate != SAMPLE_RATE:
+            source = resample_poly(source[:, 0], int(self.samplerate), SAMPLE_RATE).astype(np.float32).reshape(-1, 1)
+        source = np.repeat(source, self.channels, axis=1)
+        if self.dtype == 'int16':
+            source = (source * 32767).astype(np.int16)
+        # Blocks of the same duration whatever the device rate
+        block_frames = int(BLOCK_FRAMES * self.samplerate / SAMPLE_RATE)
+        interval = block_frames / self.samplerate / FakeInputStream.speed
+        next_time = time.perf_counter()
+        for start in range(0, len(source), block_frames):
+            if self.stopped.is_set():
+                return
+            block = source[start:start + block_frames]
+            self.callback(block, len(block), None, None)
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        FakeInputStream.finished.set()
+
+    def stop(self):
+        """Stop feeding and wait for the feeder thread."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def close(self):
+        """Nothing to release."""
+
+def install_fake_sounddevice():
+    """Register the fake module before the recorder imports sounddevice."""
+    module = types.ModuleType('sounddevice')
+    module.InputStream = FakeInputStream
+    def query_devices(device=None, kind=None):
+        info = {
+            'name': 'Synthetic',
+            'index': 0,
+            'max_input_channels': FakeInputStream.device_channels,
+            'default_samplerate': float(FakeInputStream.device_rate),
+        }
+        return info if kind else [info]
+
+    module.query_devices = query_devices
+    sys.modules['sounddevice'] = module
+
+class MockWhisperHandler(BaseHTTPRequestHandler):
+    """Answers transcription requests after a configurable delay."""
+
+    latency = 0.15
+    jitter = 0.05
+    bandwidth = None  # bytes per second, or None for unlimited
+    requests = 0
+    bytes_received = 0
+
+    def do_POST(self):
+        """Read the upload, wait like the real API would, and return a fixed text."""
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        MockWhisperHandler.requests += 1
+        MockWhisperHandler.bytes_received += len(body)
+
+        delay = max(0.0, random.gauss(self.latency, self.jitter))
+        if self.bandwidth:
+            delay += len(body) / self.bandwidth
+        time.sleep(delay)
+
+        payload = json.dumps({'text': 'the quick brown fox jumps over the lazy dog'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_HEAD(self):
+        """Connection warm-up."""
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """Keep the benchmark output clean."""
+
+def start_server():
+    """Start the mock API on a free port; returns the server."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockWhisperHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def peak_rss_mb():
+    """Return this process's peak resident set size in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def percentile(values, percent):
+    """Return the given percentile of a list of values."""
+    return float(np.percentile(values, percent)) if values else float('nan')
+
+class Clipboard:
+    """Records pasted text instead of touching the system clipboard."""
+
+    def __init__(self):
+        """Start empty."""
+        self.text = None
+
+    def copy(self, text):
+        """Remember the text."""
+        self.text = text
+
+def run_dictation(recorder, service, streaming_transcriber, clipboard, audio):
+    """Record one clip through the fake stream and return its finished trace."""
+    from speech_to_text import latency
+    from speech_to_text.vad import trim_silence
+
+    FakeInputStream.source = audio
+    trace = latency.DictationTrace()
+
+    session = streaming_transcriber.begin(language='en', trim=True) if streaming_transcriber else None
+    recorder.start_recording(
+        on_segment=session.submit_segment if session else None,
+        max_duration=len(audio) / SAMPLE_RATE + 1
+    )
+    trace.add('start', time.perf_counter() - trace.pressed)
+    trace.mark('stream_started')
+
+    # The hotkey is released as soon as the whole clip has been captured
+    FakeInputStream.finished.wait()
+    trace.since('recording', 'stream_started')
+    trace.mark('released')
+    with trace.span('stop'):
+        tail = recorder.stop_recording_audio()
+
+    # Same steps as the tray app's dictation worker
+    with latency.activate(trace), trace.span('transcribe'):
+        if session is not None and session.pending_count():
+            text = session.finish(tail)
+        else:
+            with latency.span('trim'):
+                tail = trim_silence(tail, SAMPLE_RATE)
+            text = service.transcribe_audio(tail, SAMPLE_RATE, language='en') if tail is not None else ''
+
+    with trace.span('clipboard'):
+        clipboard.copy(text)
+    trace.since('total', 'released')
+    return trace
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description='End-to-end dictation latency benchmark.')
+    parser.add_argument('--clips', type=float, nargs='+', default=[2, 5, 15, 30],
+                        help='clip lengths in seconds (default: 2 5 15 30)')
+    parser.add_argument('--runs', type=int, default=20, help='dictations per clip length (default: 20)')
+    parser.add_argument('--latency', type=float, default=0.15, help='mock API latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.05, help='standard deviation of the latency')
+    parser.add_argument('--bandwidth', type=float, default=None, help='upload bandwidth in Mbit/s')
+    parser.add_argument('--speed', type=float, default=10.0, help='capture speed relative to real time')
+    parser.add_argument('--device-rate', type=int, default=SAMPLE_RATE,
+                        help='native rate of the fake microphone (default: 16000)')
+    parser.add_argument('--device-channels', type=int, default=1, help='channels of the fake microphone')
+    parser.add_argument('--streaming', action='store_true', help='transcribe segments while recording')
+    parser.add_argument('--format', default='auto', help="upload format ('auto', 'wav', 'wav16', 'flac', 'opus')")
+    parser.add_argument('--json', action='store_true', help='print results as JSON, e.g. to save a baseline')
+    args = parser.parse_args()
+
+    MockWhisperHandler.latency = args.latency
+    MockWhisperHandler.jitter = args.jitter
+    MockWhisperHandler.bandwidth = args.bandwidth * 125000 if args.bandwidth else None
+    FakeInputStream.speed = args.speed
+    FakeInputStream.device_rate = args.device_rate
+    FakeInputStream.device_channels = args.device_channels
+    install_fake_sounddevice()
+
+    from speech_to_text.voice_capture import VoiceRecorder
+    from speech_to_text.transcription_service import TranscriptionService
+    from speech_to_text.engines import OpenAIEngine
+    from speech_to_text.streaming import StreamingTranscriber
+
+    server = start_server()
+    engine = OpenAIEngine(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key='benchmark')
+    service = TranscriptionService(upload_format=args.format, engine=engine)
+    service.warm_up()
+    recorder = VoiceRecorder(sample_rate=SAMPLE_RATE)
+    streaming_transcriber = StreamingTranscriber(service, SAMPLE_RATE) if args.streaming else None
+    clipboard = Clipboard()
+
+    results = []
+    for seconds in args.clips:
+        audio = synthetic_speech(seconds)
+        traces = []
+        cpu_start = time.process_time()
+        for _ in range(args.runs):
+            traces.append(run_dictation(recorder, service, streaming_transcriber, clipboard, audio))
+        cpu = time.process_time() - cpu_start
+
+        totals = [trace.spans['total'] * 1000 for trace in traces]
+        stages = {}
+        for stage in ('stop', 'trim', 'encode', 'upload', 'response', 'transcribe'):
+            values = [trace.spans.get(stage, 0.0) * 1000 for trace in traces]
+            stages[stage] = round(percentile(values, 50), 1)
+        results.append({
+            'clip_seconds': seconds,
+            'runs': args.runs,
+            'p50_ms': round(percentile(totals, 50), 1),
+            'p95_ms': round(percentile(totals, 95), 1),
+            'p99_ms': round(percentile(totals, 99), 1),
+            'stage_p50_ms': stages,
+            'cpu_ms_per_dictation': round(cpu / args.runs * 1000, 1),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        })
+
+    if streaming_transcriber:
+        streaming_transcriber.shutdown()
+    server.shutdown()
+
+    if args.json:
+        print(json.dumps({'settings': vars(args), 'results': results}, indent=2))
+        return
+
+    mode = 'streaming' if args.streaming else 'batch'
+    print(f"Release-to-text latency ({mode}, mock API {args.latency * 1000:.0f}+/-{args.jitter * 1000:.0f} ms, "
+          f"{MockWhisperHandler.requests} requests, {MockWhisperHandler.bytes_received / 1e6:.1f} MB uploaded)")
+    print(f"{'clip':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'trim':>8} {'encode':>8} {'upload':>8} {'cpu':>8} {'rss':>8}")
+    for result in results:
+        print(f"{result['clip_seconds']:>5.0f}s "
+              f"{result['p50_ms']:>6.0f}ms {result['p95_ms']:>6.0f}ms {result['p99_ms']:>6.0f}ms "
+              f"{result['stage_p50_ms']['trim']:>6.1f}ms {result['stage_p50_ms']['encode']:>6.1f}ms {result['stage_p50_ms']['upload']:>6.0f}ms "
+              f"{result['cpu_ms_per_dictation']:>6.1f}ms {result['peak_rss_mb']:>6.0f}MB")
+
+if __name__ == '__main__':
+    main()
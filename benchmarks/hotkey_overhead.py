@@ -0,0 +1,107 @@
+"""
+Microbenchmark of per-keystroke hotkey overhead.
+
+Replays a stream of ordinary typing through the hotkey matcher and reports the
+time spent per key event. The legacy matcher mirrors the old HotkeyManager,
+which installed one press and one release hook per key in the combo and
+scanned the combo on every event.
+
+Run from the repository root:
+    python benchmarks/hotkey_overhead.py
+"""
+import random
+import string
+import sys
+import time
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import keyboard
+from speech_to_text.hotkey_manager import HotkeyEngine, HotkeyBinding
+
+EVENTS = 200000
+
+def typing_events(count, seed=0):
+    """Return (event_type, name) pairs for random typing with occasional shift."""
+    rng = random.Random(seed)
+    keys = list(string.ascii_lowercase) + ['space', 'backspace', 'enter', '.', ',']
+    events = []
+    while len(events) < count:
+        key = rng.choice(keys)
+        shifted = rng.random() < 0.05
+        if shifted:
+            events.append((keyboard.KEY_DOWN, 'shift'))
+        events.append((keyboard.KEY_DOWN, key))
+        events.append((keyboard.KEY_UP, key))
+        if shifted:
+            events.append((keyboard.KEY_UP, 'shift'))
+    return events[:count]
+
+class Event:
+    """Minimal stand-in for keyboard.KeyboardEvent."""
+    __slots__ = ('event_type', 'name')
+
+    def __init__(self, event_type, name):
+        self.event_type = event_type
+        self.name = name
+
+def legacy_handlers(hotkey):
+    """Build the old per-key hooks: two per key in the combo, all sharing one handler."""
+    keys = hotkey.split('+')
+    pressed_keys = set()
+
+    def on_key_event(e):
+        if e.event_type == keyboard.KEY_DOWN:
+            pressed_keys.add(e.name)
+            if all(k in pressed_keys for k in keys):
+                pass
+        elif e.event_type == keyboard.KEY_UP:
+            if e.name in pressed_keys:
+                pressed_keys.remove(e.name)
+                if any(k in keys for k in [e.name]):
+                    pass
+
+    # keyboard dispatches each event to every hook; press and release hooks
+    # filter by event type before calling the handler
+    hooks = []
+    for _ in keys:
+        hooks.append((keyboard.KEY_DOWN, on_key_event))
+        hooks.append((keyboard.KEY_UP, on_key_event))
+    return hooks
+
+def bench_legacy(events, hotkey='ctrl+alt+v'):
+    """Return seconds per event for the legacy per-key hooks."""
+    hooks = legacy_handlers(hotkey)
+    start = time.perf_counter()
+    for event in events:
+        for event_type, handler in hooks:
+            if event.event_type == event_type:
+                handler(event)
+    return (time.perf_counter() - start) / len(events)
+
+def bench_engine(events, bindings):
+    """Return seconds per event for the single-hook engine with the given number of bindings."""
+    engine = HotkeyEngine()
+    engine.add(HotkeyBinding('activate', 'ctrl+alt+v', lambda: None, lambda: None))
+    for i in range(bindings - 1):
+        engine.add(HotkeyBinding(f'dictate_{i}', f'ctrl+alt+f{i + 1}', lambda: None, lambda: None))
+
+    def on_key_event(e):
+        return engine.handle(e.event_type, e.name)
+
+    start = time.perf_counter()
+    for event in events:
+        on_key_event(event)
+    return (time.perf_counter() - start) / len(events)
+
+def main():
+    """Run the benchmark and print nanoseconds per key event."""
+    events = [Event(event_type, name) for event_type, name in typing_events(EVENTS)]
+    print(f"{len(events)} key events of ordinary typing")
+    print(f"  legacy, 1 hotkey (6 hooks):  {bench_legacy(events) * 1e9:8.0f} ns/event")
+    for bindings in (1, 10, 50):
+        print(f"  engine, {bindings:2d} binding(s):       {bench_engine(events, bindings) * 1e9:8.0f} ns/event")
+
+if __name__ == '__main__':
+    main()
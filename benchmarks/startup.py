@@ -0,0 +1,134 @@
+"""
+Startup benchmark for the tray app.
+
+Reports how long after launch the hotkey is live and the warm start has
+finished, plus an `-X importtime` breakdown of what is imported before the
+hotkey is registered versus in the background.
+
+Run from the repository root (needs permission to install a keyboard hook):
+    python benchmarks/startup.py
+    python benchmarks/startup.py --imports-only
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported before the hotkey is registered, then in the background warm start
+STAGES = [
+    ('hotkey path', ['speech_to_text.tray_app']),
+    ('tray icon', ['speech_to_text.tray_icon']),
+    ('warm start', [
+        'speech_to_text.voice_capture',
+        'speech_to_text.transcription_service',
+        'speech_to_text.streaming',
+        'speech_to_text.dictation_queue',
+        'pyperclip',
+    ]),
+]
+
+READY_PATTERNS = {
+    'hotkey ready': re.compile(r'Hotkey ready'),
+    'warm start finished': re.compile(r'Warm start finished'),
+}
+
+def import_times(modules, already_imported=()):
+    """
+    Return (total_us, [(cumulative_us, module)]) for importing the modules in a fresh interpreter.
+
+    Modules in already_imported are imported first and left out of the breakdown.
+    """
+    code = ''.join(f'import {name}\n' for name in already_imported)
+    code += 'import sys\nsys.stderr.write("--- measure ---\\n")\n'
+    code += ''.join(f'import {name}\n' for name in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    stderr = result.stderr.split('--- measure ---\n', 1)[-1]
+    rows = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)', line)
+        if match:
+            depth = len(match.group(3)) // 2
+            rows.append((int(match.group(2)), depth, match.group(4)))
+
+    # Top-level imports (depth 0) add up to the total
+    total = sum(cumulative for cumulative, depth, _ in rows if depth == 0)
+    top = sorted(((cumulative, name) for cumulative, depth, name in rows), reverse=True)
+    return total, top
+
+def report_imports(limit):
+    """Print the import cost of each startup stage and its most expensive modules."""
+    imported = []
+    for stage, modules in STAGES:
+        try:
+            total, top = import_times(modules, imported)
+        except RuntimeError as e:
+            print(f"{stage}: could not import ({e})")
+            continue
+        print(f"{stage}: {total / 1000:.1f} ms")
+        for cumulative, name in top[:limit]:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        imported.extend(modules)
+
+def measure_ready(timeout):
+    """
+    Launch the tray app and return seconds until each readiness line is printed.
+
+    The app is watched from outside and killed once it is ready or the timeout passes.
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'speech_to_text'],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+
+    timings = {}
+    try:
+        for line in process.stdout:
+            for label, pattern in READY_PATTERNS.items():
+                if label not in timings and pattern.search(line):
+                    timings[label] = time.perf_counter() - start
+            if len(timings) == len(READY_PATTERNS) or time.perf_counter() - start > timeout:
+                break
+    finally:
+        process.kill()
+        process.wait()
+    return timings
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description='Measure tray app startup.')
+    parser.add_argument('--runs', type=int, default=5, help='launches to average (default: 5)')
+    parser.add_argument('--top', type=int, default=8, help='modules listed per stage (default: 8)')
+    parser.add_argument('--timeout', type=float, default=30, help='seconds to wait per launch')
+    parser.add_argument('--imports-only', action='store_true', help='skip launching the app')
+    args = parser.parse_args()
+
+    report_imports(args.top)
+    if args.imports_only:
+        return
+
+    print()
+    results = {label: [] for label in READY_PATTERNS}
+    for _ in range(args.runs):
+        for label, seconds in measure_ready(args.timeout).items():
+            results[label].append(seconds)
+    for label, samples in results.items():
+        if samples:
+            print(f"{label}: {min(samples) * 1000:.0f} ms best, "
+                  f"{sum(samples) / len(samples) * 1000:.0f} ms mean of {len(samples)}")
+        else:
+            print(f"{label}: not reached (check the app's output)")
+
+if __name__ == '__main__':
+    main()
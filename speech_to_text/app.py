@@ -2,9 +2,12 @@ import os
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 from threading import Thread
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from speech_to_text.transcription_service import TranscriptionService
+from speech_to_text.cache import TranscriptionCache
+from speech_to_text.chunking import ChunkedTranscriber
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -22,6 +25,7 @@ class SpeechToTextApp:
         # Variables
         self.file_path = None
         self.transcription_in_progress = False
+        self.transcription_service = None
         
         # Create a style for the application
         self.style = ttk.Style()
@@ -177,18 +181,25 @@ class SpeechToTextApp:
     def perform_transcription(self):
         """Background task for performing the transcription"""
         try:
-            # Initialize OpenAI client
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            # Create the service once; its client, connection pool and cache are reused
+            if self.transcription_service is None:
+                self.transcription_service = TranscriptionService(cache=TranscriptionCache())
             
-            # Perform transcription
-            with open(self.file_path, "rb") as audio_file:
-                transcription = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file
+            # Perform transcription (byte-identical files are answered from the cache).
+            # Long files are split at silences and their chunks transcribed in parallel.
+            cache = self.transcription_service.cache
+            hits = cache.hits
+            chunker = ChunkedTranscriber(self.transcription_service)
+            text = chunker.transcribe_file(
+                self.file_path,
+                on_progress=lambda partial, done, total: self.root.after(
+                    0, self.update_partial_result, partial, done, total
                 )
+            )
+            from_cache = cache.hits > hits
             
             # Update the result text area
-            self.root.after(0, self.update_transcription_result, transcription.text)
+            self.root.after(0, self.update_transcription_result, text, from_cache)
             
         except Exception as e:
             self.root.after(0, self.show_error, str(e))
@@ -196,7 +207,17 @@ class SpeechToTextApp:
         finally:
             self.root.after(0, self.reset_transcription_state)
     
-    def update_transcription_result(self, text):
+    def update_partial_result(self, text, done, total):
+        """Show the text transcribed so far while chunks are still running"""
+        self.result_text.config(state="normal")
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, text)
+        self.result_text.config(state="disabled")
+        self.result_text.see(tk.END)
+        
+        self.status_var.set(f"Transcribing... {done}/{total} chunks done")
+    
+    def update_transcription_result(self, text, from_cache=False):
         """Update the result text area with transcription"""
         self.result_text.config(state="normal")
         self.result_text.delete(1.0, tk.END)
@@ -208,7 +229,10 @@ class SpeechToTextApp:
         self.save_button.config(state="normal")
         
         # Update status
-        self.status_var.set("Transcription completed")
+        if from_cache:
+            self.status_var.set("Transcription completed (from cache)")
+        else:
+            self.status_var.set("Transcription completed")
     
     def show_error(self, error_message):
         """Show error message"""
@@ -0,0 +1,145 @@
+"""
+Asyncio transcription service for the Speech to Text application.
+Keeps many requests in flight from one thread, with the same engine, cache and retry policy
+as TranscriptionService.
+"""
+import asyncio
+import functools
+import os
+
+from speech_to_text.audio_encoding import AudioEncoder
+from speech_to_text.engines import create_engine, prune_closed_loops
+from speech_to_text.retry import RetryPolicy
+
+class AsyncTranscriptionService:
+    """Async counterpart of TranscriptionService."""
+
+    def __init__(self, upload_format='auto', engine=None, cache=None, retry_policy=None,
+                 max_concurrency=64):
+        """
+        Initialize the async transcription service.
+
+        Args:
+            upload_format (str): Encoding used for recorded audio ('auto', 'wav', 'wav16', 'flac', 'opus')
+            engine (TranscriptionEngine, optional): Backend to use; defaults to the OpenAI API
+            cache (TranscriptionCache, optional): Result cache checked before uploading
+            retry_policy (RetryPolicy, optional): Deadline, retry and hedging policy for each request
+            max_concurrency (int): Requests in flight at once; 1 for engines that aren't thread-safe
+        """
+        self.engine = engine or create_engine()
+        self.encoder = AudioEncoder(upload_format)
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_concurrency = max_concurrency if self.engine.thread_safe else 1
+        # One limit per event loop, since a semaphore belongs to the loop it was first used in
+        self._semaphores = {}
+
+    @classmethod
+    def from_service(cls, service, max_concurrency=64):
+        """Create an async service sharing a TranscriptionService's engine, encoder, cache and policy."""
+        async_service = cls(
+            engine=service.engine,
+            cache=service.cache,
+            retry_policy=service.retry_policy,
+            max_concurrency=max_concurrency
+        )
+        async_service.encoder = service.encoder
+        return async_service
+
+    @property
+    def semaphore(self):
+        """Return the running loop's concurrency limit, created on first use in that loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            prune_closed_loops(self._semaphores)
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def transcribe(self, audio, language=None, filename="audio.wav", prompt=None, use_cache=True):
+        """
+        Transcribe encoded in-memory audio.
+
+        Args:
+            audio (bytes): Encoded audio
+            language (str, optional): Language code (e.g., 'en', 'vi')
+            filename (str): Name sent with the upload; its extension tells the API the format
+            prompt (str, optional): Text to guide the model's style or vocabulary
+            use_cache (bool): Set to False to bypass the cache and always upload
+
+        Returns:
+            str: Transcribed text
+        """
+        async with self.semaphore:
+            return await self._transcribe_cached(audio, filename, language, prompt, use_cache)
+
+    async def transcribe_file(self, file_path, language=None, prompt=None, use_cache=True):
+        """Read an audio file without blocking the loop and transcribe it."""
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Audio file not found: {file_path}")
+
+        async with self.semaphore:
+            audio = await self._run_blocking(_read_file, file_path)
+            return await self._transcribe_cached(
+                audio, os.path.basename(file_path), language, prompt, use_cache
+            )
+
+    async def transcribe_audio(self, audio_data, sample_rate, language=None):
+        """Encode recorded samples in the configured upload format and transcribe them."""
+        encoded = await self._run_blocking(self.encoder.encode, audio_data, sample_rate)
+        return await self.transcribe(encoded.data, language=language, filename=encoded.filename)
+
+    async def transcribe_many(self, items, language=None, prompt=None, return_exceptions=False):
+        """
+        Transcribe many files or byte strings concurrently, bounded by max_concurrency.
+
+        Args:
+            items (iterable): File paths and/or encoded audio bytes
+            language (str, optional): Language code (e.g., 'en', 'vi')
+            prompt (str, optional): Text to guide the model's style or vocabulary
+            return_exceptions (bool): Return errors in place of results instead of raising
+
+        Returns:
+            list: Transcribed texts in the same order as the items
+        """
+        coroutines = []
+        for item in items:
+            if isinstance(item, (bytes, bytearray)):
+                coroutines.append(self.transcribe(item, language=language, prompt=prompt))
+            else:
+                coroutines.append(self.transcribe_file(item, language=language, prompt=prompt))
+        return await asyncio.gather(*coroutines, return_exceptions=return_exceptions)
+
+    async def _transcribe_cached(self, audio, filename, language, prompt, use_cache):
+        """Return a cached result for identical audio and options, or transcribe and store it."""
+        if self.cache is None or not use_cache:
+            return await self._create_transcription((filename, audio), language, prompt)
+
+        key = self.cache.make_key(audio, self.engine.describe(), language, prompt)
+        text = await self._run_blocking(self.cache.get, key)
+        if text is not None:
+            return text
+
+        text = await self._create_transcription((filename, audio), language, prompt)
+        await self._run_blocking(self.cache.put, key, text)
+        return text
+
+    async def _create_transcription(self, file, language, prompt):
+        """Send a transcription request to the engine under the retry policy."""
+        def request(timeout):
+            return self.engine.transcribe_async(file, language=language, prompt=prompt, timeout=timeout)
+
+        return await self.retry_policy.call_async(
+            request,
+            hedge=self.retry_policy.hedge and self.engine.thread_safe
+        )
+
+    async def _run_blocking(self, function, *args):
+        """Run file, cache and encoding work in the loop's thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(function, *args))
+
+def _read_file(file_path):
+    """Return the contents of a file."""
+    with open(file_path, "rb") as f:
+        return f.read()
@@ -0,0 +1,69 @@
+"""
+Audio buffer for the Speech to Text application.
+Preallocated sample storage written from the real-time audio callback.
+"""
+import numpy as np
+
+class AudioBuffer:
+    """A preallocated block of samples that the audio callback copies into."""
+
+    def __init__(self, channels=1, dtype='float32', max_frames=None, initial_frames=None):
+        """
+        Initialize the buffer.
+
+        Args:
+            channels (int): Number of channels per frame
+            dtype (str): Sample type, 'float32' or 'int16'
+            max_frames (int, optional): Hard limit on recorded frames. The buffer is
+                allocated at exactly this size and never grows.
+            initial_frames (int, optional): Starting size when there is no limit;
+                the buffer doubles when it fills up.
+        """
+        if max_frames:
+            capacity = max_frames
+        else:
+            max_frames = None
+            capacity = initial_frames or 16000 * 30
+        self.data = np.empty((capacity, channels), dtype=dtype)
+        self.max_frames = max_frames
+        self.frames = 0
+
+    @property
+    def full(self):
+        """Return True once the frame limit has been reached."""
+        return self.max_frames is not None and self.frames >= self.max_frames
+
+    def write(self, block):
+        """
+        Copy a block of frames into the buffer without allocating.
+
+        Args:
+            block (numpy.ndarray): Frames from the audio callback, shape (frames, channels)
+
+        Returns:
+            bool: False once the frame limit has been reached and further audio is dropped
+        """
+        start = self.frames
+        end = start + len(block)
+
+        if self.max_frames is not None:
+            end = min(end, self.max_frames)
+        elif end > len(self.data):
+            self._grow(end)
+
+        self.data[start:end] = block[:end - start]
+        self.frames = end
+        return not self.full
+
+    def view(self, start=0, end=None):
+        """Return the recorded frames in [start, end) as a view, without copying."""
+        if end is None:
+            end = self.frames
+        return self.data[start:end]
+
+    def _grow(self, min_frames):
+        """Double the capacity of an unbounded buffer (rare, amortized)."""
+        capacity = max(min_frames, len(self.data) * 2)
+        data = np.empty((capacity,) + self.data.shape[1:], dtype=self.data.dtype)
+        data[:self.frames] = self.data[:self.frames]
+        self.data = data
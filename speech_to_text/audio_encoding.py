@@ -0,0 +1,106 @@
+"""
+Audio encoding for the Speech to Text application.
+Encodes recorded samples into a compact format before upload.
+"""
+import io
+import numpy as np
+import scipy.io.wavfile as wav
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    # FLAC and Opus need the optional soundfile package (and libsndfile)
+    sf = None
+
+# Supported upload formats: file extension sent to the API for each
+UPLOAD_FORMATS = {
+    'wav': 'wav',      # samples as recorded (float32 by default)
+    'wav16': 'wav',    # 16-bit PCM WAV, half the size of float32
+    'flac': 'flac',    # lossless, typically about half of 16-bit PCM
+    'opus': 'ogg',     # lossy Opus in an Ogg container, smallest
+}
+
+def codec_available(upload_format):
+    """Return True if the given upload format can be encoded here."""
+    if upload_format in ('wav', 'wav16'):
+        return True
+    if sf is None:
+        return False
+    if upload_format == 'flac':
+        return 'FLAC' in sf.available_formats()
+    if upload_format == 'opus':
+        return 'OPUS' in sf.available_subtypes('OGG')
+    return False
+
+def default_upload_format():
+    """Pick the most compact lossless format available."""
+    return 'flac' if codec_available('flac') else 'wav16'
+
+def to_int16(audio_data):
+    """Convert recorded samples to 16-bit PCM."""
+    if audio_data.dtype == np.int16:
+        return audio_data
+    audio_data = np.clip(audio_data, -1.0, 1.0)
+    return (audio_data * 32767).astype(np.int16)
+
+class EncodedAudio:
+    """Encoded audio ready for upload."""
+
+    def __init__(self, data, upload_format):
+        """Initialize the encoded audio."""
+        self.data = data
+        self.format = upload_format
+        self.filename = f"audio.{UPLOAD_FORMATS[upload_format]}"
+
+    @property
+    def size(self):
+        """Return the encoded size in bytes."""
+        return len(self.data)
+
+class AudioEncoder:
+    """Encodes recorded audio in a configurable upload format."""
+
+    def __init__(self, upload_format='auto'):
+        """
+        Initialize the encoder.
+
+        Args:
+            upload_format (str): One of UPLOAD_FORMATS, or 'auto' for the best available
+        """
+        self.format = self._resolve_format(upload_format)
+
+    def _resolve_format(self, upload_format):
+        """Fall back to a format that can actually be encoded here."""
+        if upload_format in (None, 'auto'):
+            return default_upload_format()
+        if upload_format not in UPLOAD_FORMATS:
+            raise ValueError(f"Unknown upload format: {upload_format}")
+        if not codec_available(upload_format):
+            fallback = default_upload_format()
+            print(f"Upload format '{upload_format}' is not available, using '{fallback}'")
+            return fallback
+        return upload_format
+
+    def encode(self, audio_data, sample_rate):
+        """
+        Encode recorded samples.
+
+        Args:
+            audio_data (numpy.ndarray): Recorded samples, shape (frames,) or (frames, channels)
+            sample_rate (int): Sample rate of the recording
+
+        Returns:
+            EncodedAudio: The encoded data and its format
+        """
+        buffer = io.BytesIO()
+
+        if self.format == 'wav':
+            wav.write(buffer, sample_rate, audio_data)
+        elif self.format == 'wav16':
+            wav.write(buffer, sample_rate, to_int16(audio_data))
+        elif self.format == 'flac':
+            sf.write(buffer, to_int16(audio_data), sample_rate, format='FLAC', subtype='PCM_16')
+        else:
+            sf.write(buffer, audio_data, sample_rate, format='OGG', subtype='OPUS')
+
+        return EncodedAudio(buffer.getvalue(), self.format)
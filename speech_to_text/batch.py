@@ -0,0 +1,265 @@
+"""
+Batch transcription for the Speech to Text application.
+Transcribes a folder of recordings headlessly and resumes interrupted runs from a manifest.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from speech_to_text.cache import TranscriptionCache
+from speech_to_text.chunking import ChunkedTranscriber, get_duration
+from speech_to_text.engines import create_engine
+from speech_to_text.retry import RetryPolicy
+from speech_to_text.settings_manager import SettingsManager
+from speech_to_text.transcription_service import TranscriptionService
+
+AUDIO_EXTENSIONS = ('.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.wav', '.webm', '.flac', '.ogg')
+MANIFEST_NAME = '.speechtotext-manifest.jsonl'
+
+class BatchManifest:
+    """Append-only JSON-lines record of processed files, used to resume a run."""
+
+    def __init__(self, path):
+        """Load the manifest at the given path, if it exists."""
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read existing entries; the latest entry for each file wins."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A run killed mid-write can leave a partial last line
+                    continue
+                self.entries[entry['file']] = entry
+
+    def is_done(self, key, size, mtime, output_path):
+        """Return True if the file was finished unchanged and its output still exists."""
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry.get('status') == 'done'
+            and entry.get('size') == size
+            and entry.get('mtime') == mtime
+            and os.path.exists(output_path)
+        )
+
+    def record(self, entry):
+        """Append an entry and flush it to disk before returning."""
+        with self.lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries[entry['file']] = entry
+
+def find_audio_files(directory, recursive=False):
+    """Return the audio files in a directory, sorted by path."""
+    files = []
+    if recursive:
+        for root, _, names in os.walk(directory):
+            files.extend(os.path.join(root, name) for name in names)
+    else:
+        files = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted(
+        path for path in files
+        if os.path.isfile(path) and path.lower().endswith(AUDIO_EXTENSIONS)
+    )
+
+def output_path_for(file_path, input_dir, output_dir=None):
+    """
+    Return where a file's transcription is written: next to it, or mirrored under output_dir.
+
+    The audio extension is kept (talk.mp3 -> talk.mp3.txt), so talk.wav and
+    talk.mp3 in one folder don't write to the same transcript.
+    """
+    if output_dir is None:
+        return file_path + '.txt'
+    relative = os.path.relpath(file_path, input_dir)
+    return os.path.join(output_dir, relative + '.txt')
+
+def write_text_atomically(path, text):
+    """Write a text file so that readers never see a partial result."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.partial"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+class BatchTranscriber:
+    """Transcribes many files concurrently on top of TranscriptionService."""
+
+    def __init__(self, transcription_service, manifest, jobs=4, output_dir=None, language=None):
+        """
+        Initialize the batch transcriber.
+
+        Args:
+            transcription_service (TranscriptionService): Service shared by all workers
+            manifest (BatchManifest): Progress record used to skip finished files
+            jobs (int): Number of files transcribed at once
+            output_dir (str, optional): Directory for outputs; defaults to next to each input
+            language (str, optional): Language code (e.g., 'en', 'vi')
+        """
+        self.transcription_service = transcription_service
+        self.manifest = manifest
+        self.jobs = jobs if transcription_service.engine.thread_safe else 1
+        self.output_dir = output_dir
+        self.language = language
+
+        # One request per file at a time, so `jobs` bounds the requests in flight
+        self.chunker = ChunkedTranscriber(transcription_service, max_workers=1)
+
+    def run(self, files, input_dir):
+        """
+        Transcribe every file not already finished in the manifest.
+
+        Returns:
+            dict: Counts, total audio seconds and elapsed wall-clock time
+        """
+        pending = []
+        skipped = 0
+        for path in files:
+            key = os.path.relpath(path, input_dir)
+            stat = os.stat(path)
+            output_path = output_path_for(path, input_dir, self.output_dir)
+            if self.manifest.is_done(key, stat.st_size, stat.st_mtime, output_path):
+                skipped += 1
+            else:
+                pending.append((path, key, stat, output_path))
+
+        print(f"{len(files)} files found, {skipped} already done, {len(pending)} to transcribe "
+              f"with {self.jobs} workers")
+
+        stats = {'done': 0, 'failed': 0, 'skipped': skipped, 'audio_seconds': 0.0}
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="batch") as executor:
+            futures = {executor.submit(self._transcribe_one, *item): item for item in pending}
+            try:
+                for count, future in enumerate(as_completed(futures), 1):
+                    path, key, _, _ = futures[future]
+                    try:
+                        duration, elapsed = future.result()
+                        stats['done'] += 1
+                        stats['audio_seconds'] += duration or 0.0
+                        print(f"[{count}/{len(pending)}] {key} ({elapsed:.1f}s)")
+                    except Exception as e:
+                        stats['failed'] += 1
+                        print(f"[{count}/{len(pending)}] {key} FAILED: {e}")
+            except KeyboardInterrupt:
+                # Let in-flight files finish and be recorded, but start no new ones
+                for future in futures:
+                    future.cancel()
+                raise
+
+        stats['elapsed'] = time.perf_counter() - start
+        return stats
+
+    def _transcribe_one(self, path, key, stat, output_path):
+        """Transcribe one file, write its output and record it in the manifest."""
+        start = time.perf_counter()
+        duration = get_duration(path)
+        try:
+            text = self.chunker.transcribe_file(path, language=self.language)
+            write_text_atomically(output_path, text)
+        except Exception as e:
+            self.manifest.record({'file': key, 'status': 'failed', 'error': str(e)})
+            raise
+
+        elapsed = time.perf_counter() - start
+        self.manifest.record({
+            'file': key,
+            'status': 'done',
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'output': output_path,
+            'audio_seconds': duration,
+            'elapsed': round(elapsed, 3),
+        })
+        return duration, elapsed
+
+def format_throughput(stats):
+    """Return the end-of-run summary line."""
+    elapsed = max(stats['elapsed'], 1e-9)
+    files_per_minute = stats['done'] / elapsed * 60
+    audio_rate = stats['audio_seconds'] / elapsed
+    return (
+        f"Done: {stats['done']} transcribed, {stats['failed']} failed, {stats['skipped']} skipped "
+        f"in {stats['elapsed']:.1f}s - {files_per_minute:.1f} files/min, "
+        f"{audio_rate:.1f} audio-seconds/sec"
+    )
+
+def create_file_service(use_cache=True):
+    """
+    Create a TranscriptionService for files from the user's engine and network settings.
+
+    The dictation deadline is left out, since a long file can legitimately take minutes.
+
+    Args:
+        use_cache (bool): Set to False to always upload, ignoring cached results
+
+    Returns:
+        TranscriptionService: The configured service
+    """
+    settings_manager = SettingsManager()
+    return TranscriptionService(
+        engine=create_engine(settings_manager.get_setting('transcription')),
+        cache=TranscriptionCache(enabled=use_cache),
+        retry_policy=RetryPolicy(
+            max_attempts=settings_manager.get_setting('network', 'max_attempts'),
+            hedge=settings_manager.get_setting('network', 'hedge')
+        )
+    )
+
+def main(argv=None):
+    """Run the batch command. Returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog='python -m speech_to_text batch',
+        description='Transcribe every audio file in a folder.'
+    )
+    parser.add_argument('directory', help='folder of recordings')
+    parser.add_argument('-o', '--output-dir', help='write transcripts here instead of next to the inputs')
+    parser.add_argument('-j', '--jobs', type=int, default=4, help='files transcribed at once (default: 4)')
+    parser.add_argument('-l', '--language', help="language code, e.g. 'en'")
+    parser.add_argument('-r', '--recursive', action='store_true', help='include subfolders')
+    parser.add_argument('--manifest', help=f'progress file (default: {MANIFEST_NAME} in the output folder)')
+    parser.add_argument('--no-cache', action='store_true', help='always upload, ignoring cached results')
+    args = parser.parse_args(argv)
+
+    input_dir = os.path.abspath(args.directory)
+    if not os.path.isdir(input_dir):
+        parser.error(f"not a directory: {args.directory}")
+    output_dir = os.path.abspath(args.output_dir) if args.output_dir else None
+    manifest_path = args.manifest or os.path.join(output_dir or input_dir, MANIFEST_NAME)
+
+    try:
+        service = create_file_service(use_cache=not args.no_cache)
+    except ValueError as e:
+        print(f"Configuration error: {e}")
+        return 1
+    batch = BatchTranscriber(
+        service,
+        BatchManifest(manifest_path),
+        jobs=max(1, args.jobs),
+        output_dir=output_dir,
+        language=args.language
+    )
+
+    try:
+        stats = batch.run(find_audio_files(input_dir, args.recursive), input_dir)
+    except KeyboardInterrupt:
+        print("Interrupted; finished files are recorded and will be skipped next time.")
+        return 130
+
+    print(format_throughput(stats))
+    return 1 if stats['failed'] else 0
@@ -0,0 +1,175 @@
+"""
+Transcription cache for the Speech to Text application.
+Stores results in SQLite, keyed by a hash of the audio bytes and the request options.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+class TranscriptionCache:
+    """A persistent, size-capped, least-recently-used cache of transcriptions."""
+
+    def __init__(self, path=None, max_size_mb=50, enabled=True):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str, optional): SQLite database file; defaults to ~/.speechtotext/cache.sqlite3
+            max_size_mb (float): Size cap for stored entries; least recently used are evicted first
+            enabled (bool): When False, every lookup misses and nothing is stored
+        """
+        self.path = path or os.path.expanduser("~/.speechtotext/cache.sqlite3")
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def _connect(self):
+        """Open the database on first use."""
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS transcriptions ("
+                " key TEXT PRIMARY KEY,"
+                " text TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS transcriptions_last_used ON transcriptions (last_used)"
+            )
+            self.connection.commit()
+        return self.connection
+
+    @staticmethod
+    def make_key(audio, model, language=None, prompt=None):
+        """
+        Build the cache key for a request.
+
+        Args:
+            audio (bytes): The encoded audio exactly as it would be uploaded
+            model (str): Engine/model description
+            language (str, optional): Language code
+            prompt (str, optional): Prompt sent with the request
+
+        Returns:
+            str: A hex digest identifying the request
+        """
+        return TranscriptionCache._finish_key(hashlib.sha256(audio), model, language, prompt)
+
+    @staticmethod
+    def make_file_key(file_path, model, language=None, prompt=None, block_size=1024 * 1024):
+        """
+        Build the same key as make_key for a file's contents, reading it a block at a time.
+
+        Returns:
+            str: A hex digest identifying the request
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return TranscriptionCache._finish_key(digest, model, language, prompt)
+
+    @staticmethod
+    def _finish_key(digest, model, language, prompt):
+        """Add the request options to a digest of the audio and return the key."""
+        for part in (model, language, prompt):
+            digest.update(b"\0")
+            digest.update((part or "").encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached text for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        with self.lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT text FROM transcriptions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                connection.execute(
+                    "UPDATE transcriptions SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+                connection.commit()
+                self.hits += 1
+                return row[0]
+            except sqlite3.Error as e:
+                print(f"Error reading transcription cache: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, key, text):
+        """Store a result and evict the least recently used entries over the size cap."""
+        if not self.enabled:
+            return
+
+        size = len(key) + len(text.encode("utf-8"))
+        with self.lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO transcriptions (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, text, size, time.time())
+                )
+                self._evict(connection)
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Error writing transcription cache: {e}")
+
+    def _evict(self, connection):
+        """Delete least recently used entries until the cache fits its cap."""
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM transcriptions").fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        excess = total - self.max_size
+        freed = 0
+        keys = []
+        for key, size in connection.execute(
+                "SELECT key, size FROM transcriptions ORDER BY last_used"):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        connection.executemany("DELETE FROM transcriptions WHERE key = ?", keys)
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self.lock:
+            try:
+                connection = self._connect()
+                connection.execute("DELETE FROM transcriptions")
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Error clearing transcription cache: {e}")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current entry count and size."""
+        with self.lock:
+            entries, size = 0, 0
+            try:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcriptions"
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error reading transcription cache: {e}")
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries,
+                'size': size,
+            }
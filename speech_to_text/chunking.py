@@ -0,0 +1,262 @@
+"""
+Chunked transcription for the Speech to Text application.
+Splits long recordings at silences and transcribes the pieces in parallel.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+import scipy.io.wavfile as wav
+from scipy.signal import resample_poly
+
+from speech_to_text.resampler import StreamingResampler
+from speech_to_text.vad import frame_features, to_mono_float
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    sf = None
+
+# Chunks are planned and sent at the rate Whisper works at (and the local engine requires)
+TARGET_RATE = 16000
+
+# Frames decoded at a time, so a long file never has to fit in memory at its own rate
+BLOCK_FRAMES = 65536
+
+# Seconds each chunk runs past its cut, and the most words that much fast speech
+# (about 4 words a second) can hold; longer repeats at a seam are real speech
+SEAM_OVERLAP = 0.5
+MAX_SEAM_WORDS = int(SEAM_OVERLAP * 4) + 1
+
+def _to_float(block):
+    """Return integer PCM samples as float32 on a -1..1 scale; float samples are passed through."""
+    if block.dtype.kind == 'i':
+        return block.astype(np.float32) / float(2 ** (8 * block.dtype.itemsize - 1))
+    if block.dtype.kind == 'u':
+        return (block.astype(np.float32) - 128.0) / 128.0
+    return block.astype(np.float32, copy=False)
+
+def load_audio(file_path):
+    """
+    Decode an audio file to 16 kHz mono samples, a block at a time.
+
+    Each block is downmixed and resampled as it is read, so memory use is that
+    of the 16 kHz mono result rather than of the file at its own rate.
+    WAV files are always supported; other formats need the optional soundfile package.
+
+    Returns:
+        tuple: (samples, sample_rate), or None if the file can't be decoded here
+    """
+    try:
+        if sf is not None:
+            info = sf.info(file_path)
+            sample_rate, channels, frames = info.samplerate, info.channels, info.frames
+            blocks = sf.blocks(file_path, blocksize=BLOCK_FRAMES, dtype='float32', always_2d=True)
+        elif file_path.lower().endswith('.wav'):
+            # Memory-mapped, so slicing it only reads that block from disk
+            sample_rate, mapped = wav.read(file_path, mmap=True)
+            mapped = mapped.reshape(len(mapped), -1)
+            channels, frames = mapped.shape[1], len(mapped)
+            blocks = (mapped[start:start + BLOCK_FRAMES] for start in range(0, frames, BLOCK_FRAMES))
+        else:
+            return None
+
+        resampler = StreamingResampler(sample_rate, TARGET_RATE, channels, 'float32')
+        expected = -(-frames * resampler.up // resampler.down)
+        samples = np.empty(expected, dtype=np.float32)
+        filled = 0
+
+        def append(converted):
+            nonlocal filled
+            converted = converted[:expected - filled, 0]
+            samples[filled:filled + len(converted)] = converted
+            filled += len(converted)
+
+        for block in blocks:
+            append(resampler.process(_to_float(np.asarray(block))))
+        # The filter holds back its last few outputs until it sees later input
+        append(resampler.process(np.zeros((sample_rate // 10, channels), dtype=np.float32)))
+    except Exception as e:
+        print(f"Could not decode {file_path} for chunking: {e}")
+        return None
+
+    return samples[:filled], TARGET_RATE
+
+def get_duration(file_path):
+    """Return the length of an audio file in seconds without decoding it, or None if unknown."""
+    try:
+        if sf is not None:
+            return sf.info(file_path).duration
+        if file_path.lower().endswith('.wav'):
+            sample_rate, samples = wav.read(file_path, mmap=True)
+            return len(samples) / float(sample_rate)
+    except Exception:
+        pass
+    return None
+
+def find_chunks(samples, sample_rate, max_chunk=60.0, search_window=10.0, overlap=SEAM_OVERLAP):
+    """
+    Plan chunk boundaries at the quietest point before each size limit.
+
+    Args:
+        samples (numpy.ndarray): Mono samples
+        sample_rate (int): Sample rate of the samples
+        max_chunk (float): Maximum chunk length in seconds
+        search_window (float): How far back from the limit to look for a silence, in seconds
+        overlap (float): Seconds each chunk extends past its cut, so no word is lost at a seam
+
+    Returns:
+        list: (start, end) sample indices of each chunk, in order
+    """
+    total = len(samples)
+    max_length = int(max_chunk * sample_rate)
+    if total <= max_length:
+        return [(0, total)]
+
+    rms, _, frame_length = frame_features(samples, sample_rate, frame_ms=50)
+    window_frames = max(1, int(search_window * sample_rate) // frame_length)
+    extra = int(overlap * sample_rate)
+
+    chunks = []
+    start = 0
+    while total - start > max_length:
+        # Quietest frame in the search window ending at the size limit
+        limit_frame = (start + max_length) // frame_length
+        first_frame = max(start // frame_length + 1, limit_frame - window_frames)
+        cut_frame = first_frame + int(np.argmin(rms[first_frame:limit_frame]))
+        cut = cut_frame * frame_length + frame_length // 2
+
+        chunks.append((start, min(total, cut + extra)))
+        start = cut
+    chunks.append((start, total))
+    return chunks
+
+def _words(text):
+    """Return normalized words for overlap matching."""
+    return [re.sub(r"[^\w']", "", word).lower() for word in text.split()]
+
+def merge_texts(previous, following, max_overlap=MAX_SEAM_WORDS):
+    """
+    Join two chunk texts, dropping words repeated across the seam.
+
+    Args:
+        previous (str): Text of the earlier chunk
+        following (str): Text of the later chunk
+        max_overlap (int): Maximum number of repeated words to look for
+
+    Returns:
+        str: The joined text
+    """
+    previous = previous.strip()
+    following = following.strip()
+    if not previous or not following:
+        return previous or following
+
+    previous_words = _words(previous)
+    following_split = following.split()
+    following_words = _words(following)
+
+    # Longest suffix of the earlier text that is also a prefix of the later one
+    for size in range(min(max_overlap, len(previous_words), len(following_words)), 0, -1):
+        if previous_words[-size:] == following_words[:size]:
+            following = " ".join(following_split[size:])
+            break
+
+    return f"{previous} {following}".strip()
+
+class ChunkedTranscriber:
+    """Transcribes long files as parallel, silence-aligned chunks."""
+
+    def __init__(self, transcription_service, max_workers=4, max_chunk=60.0):
+        """
+        Initialize the chunked transcriber.
+
+        Args:
+            transcription_service (TranscriptionService): Service used for each chunk
+            max_workers (int): Maximum chunks in flight (also capped by the engine)
+            max_chunk (float): Maximum chunk length in seconds
+        """
+        self.transcription_service = transcription_service
+        self.max_workers = max(1, min(max_workers, transcription_service.max_concurrency))
+        self.max_chunk = max_chunk
+
+    def transcribe_file(self, file_path, language=None, on_progress=None):
+        """
+        Transcribe a file, chunking it when it is long enough to benefit.
+
+        Files that are short or can't be decoded here are sent in one request.
+
+        Args:
+            file_path (str): Path to the audio file
+            language (str, optional): Language code (e.g., 'en', 'vi')
+            on_progress (callable, optional): Called as on_progress(text, done, total) each
+                time a chunk finishes, with the in-order text transcribed so far
+
+        Returns:
+            str: The full transcription
+        """
+        # Same cache entry as a single-request upload of this file
+        service = self.transcription_service
+        key = service.file_cache_key(file_path, language=language)
+        if key is not None:
+            text = service.cache.get(key)
+            if text is not None:
+                return text
+
+        decoded = load_audio(file_path)
+        if decoded is None:
+            return service.transcribe_audio_file(file_path, language=language)
+
+        samples, sample_rate = decoded
+        chunks = find_chunks(samples, sample_rate, max_chunk=self.max_chunk)
+        if len(chunks) == 1:
+            return service.transcribe_audio_file(file_path, language=language)
+
+        text = self.transcribe_samples(samples, sample_rate, chunks, language, on_progress)
+        if key is not None:
+            service.cache.put(key, text)
+        return text
+
+    def transcribe_samples(self, samples, sample_rate, chunks, language=None, on_progress=None):
+        """Transcribe planned chunks concurrently and stitch them back together in order."""
+        results = [None] * len(chunks)
+        merged_text = ""
+        merged_count = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chunk") as executor:
+            futures = {
+                executor.submit(
+                    self._transcribe_chunk,
+                    samples[start:end],
+                    sample_rate,
+                    language
+                ): index
+                for index, (start, end) in enumerate(chunks)
+            }
+
+            done = 0
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result() or ""
+                except Exception:
+                    # Don't start chunks that haven't been picked up yet
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                done += 1
+
+                # Extend the in-order prefix with every chunk that is now contiguous
+                while merged_count < len(results) and results[merged_count] is not None:
+                    merged_text = merge_texts(merged_text, results[merged_count])
+                    merged_count += 1
+
+                if on_progress:
+                    on_progress(merged_text, done, len(chunks))
+
+        return merged_text
+
+    def _transcribe_chunk(self, samples, sample_rate, language):
+        """Transcribe one chunk as 16 kHz mono, resampling it if it isn't already."""
+        samples = to_mono_float(samples)
+        if sample_rate != TARGET_RATE:
+            samples = resample_poly(samples, TARGET_RATE, sample_rate).astype(np.float32)
+        return self.transcription_service.transcribe_audio(samples, TARGET_RATE, language=language)
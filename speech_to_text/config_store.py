@@ -0,0 +1,209 @@
+"""
+Config store for the Speech to Text application.
+One in-memory copy of config.json shared by every manager, saved atomically and debounced.
+"""
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_CONFIG_PATH = os.path.expanduser("~/.speechtotext/config.json")
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def merge_missing(target, defaults):
+    """Add keys from defaults that target lacks, recursing into nested dicts."""
+    for key, value in defaults.items():
+        if key not in target:
+            target[key] = copy.deepcopy(value)
+        elif isinstance(target[key], dict) and isinstance(value, dict):
+            merge_missing(target[key], value)
+
+class ConfigStore:
+    """A JSON config file kept in memory, written back in batches."""
+
+    def __init__(self, path, debounce=0.5, check_interval=1.0):
+        """
+        Load the config file.
+
+        Args:
+            path (str): Location of the JSON file
+            debounce (float): Seconds to wait after a change before writing, so bursts coalesce
+            check_interval (float): Minimum seconds between checks for external edits
+        """
+        self.path = path
+        self.debounce = debounce
+        self.check_interval = check_interval
+        self.data = {}
+        self.defaults = {}
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.timer = None
+        self.batch_depth = 0
+        self.file_state = None
+        self.last_check = 0.0
+        self.load()
+
+    def register_defaults(self, defaults):
+        """
+        Add default values, kept in memory for keys the file doesn't set.
+
+        Returns:
+            bool: True if the config file doesn't exist yet
+        """
+        with self.lock:
+            merge_missing(self.defaults, defaults)
+            merge_missing(self.data, defaults)
+            return self.file_state is None
+
+    def load(self):
+        """Read the file, layered over the registered defaults."""
+        with self.lock:
+            data = copy.deepcopy(self.defaults)
+            # Recorded before parsing: a file that exists but can't be read is left
+            # as it is, not treated as missing and overwritten with defaults
+            state = self._stat()
+            self.file_state = state
+            try:
+                if state is not None:
+                    with open(self.path, 'r') as f:
+                        loaded = json.load(f)
+                    data.update(loaded)
+                    merge_missing(data, self.defaults)
+            except Exception as e:
+                print(f"Error loading config: {e}")
+            self.data = data
+
+    def reload_if_changed(self):
+        """Reload the file if another process edited it; throttled to one stat per check_interval."""
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval:
+            return False
+        self.last_check = now
+
+        with self.lock:
+            # Unsaved local changes win over the file
+            if self.dirty:
+                return False
+            state = self._stat()
+            if state is None or state == self.file_state:
+                return False
+            self.load()
+            return True
+
+    def get(self, *keys, default=None):
+        """Return the value at the given key path, or default if it is missing."""
+        self.reload_if_changed()
+        current = self.data
+        for key in keys:
+            if not isinstance(current, dict) or key not in current:
+                return default
+            current = current[key]
+        return current
+
+    def set(self, value, *keys):
+        """Set the value at the given key path and schedule a save."""
+        with self.lock:
+            current = self.data
+            for key in keys[:-1]:
+                if not isinstance(current.get(key), dict):
+                    current[key] = {}
+                current = current[key]
+            current[keys[-1]] = value
+            self.mark_dirty()
+
+    def replace(self, data):
+        """Replace the whole config and schedule a save."""
+        with self.lock:
+            self.data = data
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        """Schedule a save after the debounce delay, restarting it on every change."""
+        with self.lock:
+            self.dirty = True
+            if self.batch_depth:
+                return
+            if self.timer is not None:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.debounce, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    @contextmanager
+    def batch(self):
+        """Group several changes into a single write, made as soon as the block ends."""
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                done = self.batch_depth == 0
+            if done:
+                self.flush()
+
+    def flush(self):
+        """Write pending changes now: temp file, fsync, then rename over the config."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return
+            self.save()
+
+    def save(self):
+        """Write the config atomically so a crash never leaves a truncated file."""
+        with self.lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(self.data, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                self.file_state = self._stat()
+                self.dirty = False
+            except Exception as e:
+                print(f"Error saving config: {e}")
+
+    def _stat(self):
+        """Return (mtime_ns, size) of the file, or None if it doesn't exist."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+def get_config_store(path=None):
+    """
+    Return the process-wide store for a config file, loading it on first use.
+
+    Args:
+        path (str, optional): Config file; defaults to ~/.speechtotext/config.json
+
+    Returns:
+        ConfigStore: The shared store for this file
+    """
+    path = os.path.abspath(path or DEFAULT_CONFIG_PATH)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = ConfigStore(path)
+            _stores[path] = store
+        return store
+
+@atexit.register
+def _flush_all():
+    """Write any pending changes before the process exits."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
@@ -0,0 +1,73 @@
+"""
+Dictation job queue for the Speech to Text application.
+Runs encode -> transcribe off the hotkey thread and delivers results in spoken order.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class DictationQueue:
+    """Transcribes dictations concurrently but hands their results over strictly in order."""
+
+    def __init__(self, on_result, on_error, max_workers=2):
+        """
+        Initialize the queue and start the delivery thread.
+
+        Args:
+            on_result (callable): Called with each finished job's return value, in order
+                (the tray app's jobs return a (text, trace) tuple)
+            on_error (callable): Called as on_error(exception) for a dictation that failed, in order
+            max_workers (int): Dictations transcribed at once, so back-to-back ones overlap
+        """
+        self.on_result = on_result
+        self.on_error = on_error
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dictation")
+        self.results = queue.Queue()
+        self.submit_lock = threading.Lock()
+
+        self.delivery_thread = threading.Thread(target=self._deliver, name="dictation-delivery")
+        self.delivery_thread.daemon = True
+        self.delivery_thread.start()
+
+    def submit(self, job, *args):
+        """
+        Queue a dictation job and return immediately.
+
+        Args:
+            job (callable): Does the encode/transcribe work; its return value goes to on_result
+            *args: Arguments for the job
+        """
+        # Submitting and enqueueing together keeps delivery order equal to submit order
+        with self.submit_lock:
+            self.results.put(self.executor.submit(job, *args))
+
+    def pending_count(self):
+        """Return the number of dictations not yet delivered."""
+        return self.results.qsize()
+
+    def shutdown(self):
+        """Stop accepting jobs and let the delivery thread exit."""
+        self.results.put(None)
+        self.executor.shutdown(wait=False)
+
+    def _deliver(self):
+        """Wait for each job in submission order and hand over its result."""
+        while True:
+            future = self.results.get()
+            if future is None:
+                return
+
+            try:
+                result = future.result()
+            except Exception as e:
+                self._safe_call(self.on_error, e)
+            else:
+                self._safe_call(self.on_result, result)
+
+    @staticmethod
+    def _safe_call(callback, value):
+        """Run a delivery callback without letting it kill the delivery thread."""
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Error delivering dictation: {e}")
@@ -0,0 +1,257 @@
+"""
+Transcription engines for the Speech to Text application.
+Each engine wraps one backend: the OpenAI API, an OpenAI-compatible server, or a local model.
+"""
+import asyncio
+import functools
+import io
+import os
+import threading
+
+from speech_to_text.http_client import get_shared_client, create_async_client, close_with_loop
+
+def prune_closed_loops(per_loop):
+    """
+    Drop entries for event loops that have been closed from a dict keyed by loop.
+
+    The values (semaphores, async clients) refer back to their loop, so weak
+    keys would never be released; closed loops are removed explicitly instead.
+    """
+    for loop in list(per_loop):
+        if loop.is_closed():
+            per_loop.pop(loop, None)
+
+class TranscriptionEngine:
+    """Base class for transcription backends."""
+
+    # Backend capabilities, used to size worker pools and pick the input format
+    name = None
+    thread_safe = True
+    max_concurrency = 1
+    accepts_samples = False
+
+    def transcribe(self, file, language=None, prompt=None, timeout=None):
+        """
+        Transcribe encoded audio.
+
+        Args:
+            file: An open binary file, or a (filename, bytes) tuple
+            language (str, optional): Language code (e.g., 'en', 'vi')
+            prompt (str, optional): Text to guide the model's style or vocabulary
+            timeout (float, optional): Seconds before the request is abandoned, if supported
+
+        Returns:
+            str: Transcribed text
+        """
+        raise NotImplementedError
+
+    def transcribe_samples(self, samples, sample_rate, language=None, prompt=None):
+        """Transcribe mono float32 samples directly (only if accepts_samples)."""
+        raise NotImplementedError
+
+    async def transcribe_async(self, file, language=None, prompt=None, timeout=None):
+        """
+        Transcribe encoded audio from a coroutine.
+
+        The default runs the blocking transcribe() in the loop's thread pool;
+        engines with a native async client override it.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            functools.partial(self.transcribe, file, language=language, prompt=prompt, timeout=timeout)
+        )
+
+    def warm_up(self):
+        """Prepare the backend for an imminent request (no-op by default)."""
+        return False
+
+    def describe(self):
+        """Return a short human-readable description of the engine."""
+        return self.name
+
+class OpenAIEngine(TranscriptionEngine):
+    """Whisper through the OpenAI API or any server that speaks the same protocol."""
+
+    name = 'openai'
+    thread_safe = True
+
+    def __init__(self, model='whisper-1', base_url=None, api_key=None, max_concurrency=8):
+        """
+        Initialize the engine.
+
+        Args:
+            model (str): Model name sent with each request
+            base_url (str, optional): Base URL of an OpenAI-compatible server, e.g. a LAN whisper server
+            api_key (str, optional): API key; defaults to OPENAI_API_KEY from the environment
+            max_concurrency (int): Requests the backend is expected to handle at once
+        """
+        self.model = model
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+
+        if base_url and not (api_key or os.getenv("OPENAI_API_KEY")):
+            # Local servers usually ignore the key, but the client requires one
+            api_key = "not-needed"
+
+        # Without arguments the client uses OPENAI_API_KEY / OPENAI_BASE_URL from env.
+        # The client and its keep-alive pool are shared by every engine for this endpoint.
+        self.shared_client = get_shared_client(api_key=api_key, base_url=base_url)
+        self.client = self.shared_client.client
+        self.api_key = api_key
+        # Async clients are kept per event loop, as their connection pools belong to it;
+        # each is closed when its loop shuts down
+        self.async_clients = {}
+
+    def warm_up(self):
+        """Open the connection in the background so TLS setup overlaps with speaking."""
+        return self.shared_client.warm_up()
+
+    def transcribe(self, file, language=None, prompt=None, timeout=None):
+        """Send one transcription request and return its text."""
+        options = {'timeout': timeout} if timeout is not None else {}
+        transcription = self.client.audio.transcriptions.create(
+            model=self.model,
+            file=file,
+            language=language if language else None,
+            prompt=prompt if prompt else None,
+            **options
+        )
+
+        return transcription.text
+
+    async def transcribe_async(self, file, language=None, prompt=None, timeout=None):
+        """Send one transcription request with the async client and return its text."""
+        loop = asyncio.get_running_loop()
+        entry = self.async_clients.get(loop)
+        if entry is None:
+            # Created on first use, inside the event loop that will run it
+            prune_closed_loops(self.async_clients)
+            async_client = create_async_client(api_key=self.api_key, base_url=self.base_url)
+            entry = self.async_clients[loop] = (async_client, await close_with_loop(async_client))
+        async_client = entry[0]
+
+        options = {'timeout': timeout} if timeout is not None else {}
+        transcription = await async_client.audio.transcriptions.create(
+            model=self.model,
+            file=file,
+            language=language if language else None,
+            prompt=prompt if prompt else None,
+            **options
+        )
+
+        return transcription.text
+
+    def describe(self):
+        """Return a short human-readable description of the engine."""
+        return f"{self.model} at {self.base_url}" if self.base_url else self.model
+
+class LocalWhisperEngine(TranscriptionEngine):
+    """In-process CPU transcription with a local faster-whisper model."""
+
+    name = 'local'
+    thread_safe = False
+    max_concurrency = 1
+    accepts_samples = True
+
+    def __init__(self, model_path, compute_type='int8', cpu_threads=0):
+        """
+        Load the model.
+
+        Args:
+            model_path (str): Directory of a CTranslate2 Whisper model
+            compute_type (str): Quantization used on the CPU
+            cpu_threads (int): Threads used by the model (0 = library default)
+        """
+        from faster_whisper import WhisperModel
+
+        self.model_path = os.path.expanduser(model_path)
+        self.model = WhisperModel(
+            self.model_path,
+            device='cpu',
+            compute_type=compute_type,
+            cpu_threads=cpu_threads
+        )
+
+        # The model is not safe to call from several threads at once
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def is_available(model_path):
+        """Return True if faster-whisper is installed and the model exists."""
+        if not model_path or not os.path.isdir(os.path.expanduser(model_path)):
+            return False
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def transcribe(self, file, language=None, prompt=None, timeout=None):
+        """Decode and transcribe encoded audio (the timeout does not apply in-process)."""
+        if isinstance(file, tuple):
+            file = io.BytesIO(file[1])
+        return self._run(file, language, prompt)
+
+    def transcribe_samples(self, samples, sample_rate, language=None, prompt=None):
+        """Transcribe 16 kHz mono float32 samples without encoding them."""
+        if sample_rate != 16000:
+            raise ValueError("The local engine expects 16 kHz audio")
+        return self._run(samples, language, prompt)
+
+    def stream(self, audio, language=None, prompt=None):
+        """Yield text segments as the model produces them."""
+        with self.lock:
+            segments, _ = self.model.transcribe(
+                audio,
+                language=language,
+                initial_prompt=prompt,
+                temperature=0.0
+            )
+            for segment in segments:
+                yield segment.text
+
+    def _run(self, audio, language, prompt):
+        """Run the model and join the segment texts."""
+        return "".join(self.stream(audio, language=language, prompt=prompt)).strip()
+
+    def describe(self):
+        """Return a short human-readable description of the engine."""
+        return f"local model {self.model_path}"
+
+def create_engine(config=None):
+    """
+    Create the engine selected in the 'transcription' settings.
+
+    Args:
+        config (dict, optional): The 'transcription' settings section
+
+    Returns:
+        TranscriptionEngine: The configured engine. A local engine whose model
+        is missing falls back to the OpenAI API; 'openai_compatible' without
+        a base_url raises ValueError.
+    """
+    config = config or {}
+    engine = config.get('engine') or 'openai'
+    model = config.get('model') or 'whisper-1'
+
+    if engine == 'local':
+        model_path = config.get('local_model_path')
+        if LocalWhisperEngine.is_available(model_path):
+            return LocalWhisperEngine(model_path)
+        print(f"Local model not available at {model_path}, using the OpenAI API")
+        return OpenAIEngine(model=model)
+
+    if engine == 'openai_compatible':
+        # Falling back to api.openai.com would send audio meant for a private server
+        if not config.get('base_url'):
+            raise ValueError("The 'openai_compatible' engine needs transcription.base_url")
+        return OpenAIEngine(
+            model=model,
+            base_url=config.get('base_url'),
+            max_concurrency=config.get('max_concurrency') or 2
+        )
+
+    if engine != 'openai':
+        print(f"Unknown transcription engine '{engine}', using the OpenAI API")
+    return OpenAIEngine(model=model)
@@ -3,106 +3,219 @@ Hotkey manager for the Speech to Text application.
 Handles global hotkey registration and triggering.
 """
 import keyboard
-import json
-import os
+
+from speech_to_text.config_store import get_config_store
+
+# Left/right and alternate names of the same key all match one chord key
+KEY_ALIASES = {
+    'control': 'ctrl',
+    'left ctrl': 'ctrl',
+    'right ctrl': 'ctrl',
+    'left shift': 'shift',
+    'right shift': 'shift',
+    'left alt': 'alt',
+    'right alt': 'alt',
+    'alt gr': 'alt',
+    'option': 'alt',
+    'left windows': 'windows',
+    'right windows': 'windows',
+    'win': 'windows',
+    'super': 'windows',
+    'command': 'windows',
+    'cmd': 'windows',
+    'return': 'enter',
+    'esc': 'escape',
+    'spacebar': 'space',
+}
+
+MODIFIER_KEYS = frozenset({'ctrl', 'shift', 'alt', 'windows'})
+
+def normalize_key(name):
+    """Return the canonical name of a key, e.g. 'Left Ctrl' -> 'ctrl'."""
+    name = name.strip().lower()
+    return KEY_ALIASES.get(name, name)
+
+def parse_hotkey(hotkey):
+    """Return the set of canonical keys in a hotkey string such as 'ctrl+alt+v'."""
+    return frozenset(normalize_key(key) for key in hotkey.split('+') if key.strip())
+
+class HotkeyBinding:
+    """A named chord and its press/release callbacks."""
+    
+    def __init__(self, name, hotkey, on_press, on_release=None):
+        """Parse the hotkey and store the callbacks."""
+        self.name = name
+        self.hotkey = hotkey
+        self.keys = parse_hotkey(hotkey)
+        self.on_press = on_press
+        self.on_release = on_release
+        
+class HotkeyEngine:
+    """
+    Matches key events against many chords with constant work per keystroke.
+    
+    Every registered chord is compiled into a dict keyed by its frozenset of
+    keys, so a key-down costs one set update and one dict lookup no matter how
+    many bindings exist. Key names are normalized once per distinct name and
+    cached, so the hot path never lowercases or parses strings.
+    """
+    
+    def __init__(self):
+        """Start with no bindings and no keys held."""
+        self.bindings = {}
+        self.chords = {}
+        self.chord_keys = frozenset()
+        self.pressed = set()
+        self.active = None
+        self._names = {}
+        
+    def add(self, binding):
+        """Add or replace a binding and recompile the lookup table."""
+        self.bindings[binding.name] = binding
+        self._compile()
+        
+    def remove(self, name):
+        """Remove a binding; returns False if it wasn't registered."""
+        if self.bindings.pop(name, None) is None:
+            return False
+        if self.active is not None and self.active.name == name:
+            self.active = None
+        self._compile()
+        return True
+        
+    def clear(self):
+        """Remove every binding and forget held keys."""
+        self.bindings = {}
+        self.active = None
+        self.pressed.clear()
+        self._compile()
+        
+    def _compile(self):
+        """Rebuild the chord table; swapped in whole so the hook never sees a partial one."""
+        chords = {}
+        for binding in self.bindings.values():
+            if binding.keys in chords:
+                print(f"Hotkey '{binding.hotkey}' is bound twice; "
+                      f"'{binding.name}' replaces '{chords[binding.keys].name}'")
+            chords[binding.keys] = binding
+        self.chords = chords
+        self.chord_keys = frozenset().union(*chords) if chords else frozenset()
+        
+    def _normalize(self, name):
+        """Return the canonical key name, cached per raw name."""
+        key = self._names.get(name)
+        if key is None:
+            key = normalize_key(name or '')
+            self._names[name] = key
+        return key
+        
+    def handle(self, event_type, name):
+        """
+        Process one key event.
+        
+        Args:
+            event_type (str): keyboard.KEY_DOWN or keyboard.KEY_UP
+            name (str): Key name as reported by the keyboard library
+            
+        Returns:
+            bool: True to let the event through, False to suppress it
+        """
+        key = self._names.get(name) or self._normalize(name)
+        
+        if event_type == keyboard.KEY_DOWN:
+            if key in self.pressed:
+                # Auto-repeat: swallow it for an active chord, otherwise pass it on
+                return self.active is None or key not in self.active.keys
+            self.pressed.add(key)
+            if self.active is not None or key not in self.chord_keys:
+                return True
+            
+            binding = self.chords.get(frozenset(self.pressed))
+            if binding is None:
+                return True
+            self.active = binding
+            binding.on_press()
+            # Keep the chord's final key from reaching the focused window
+            return False
+            
+        self.pressed.discard(key)
+        active = self.active
+        if active is None or key not in active.keys:
+            return True
+        self.active = None
+        if active.on_release is not None:
+            active.on_release()
+        # Modifiers must be released normally or the OS thinks they are still held
+        return key in MODIFIER_KEYS
 
 class HotkeyManager:
     """Manages global hotkeys for the application."""
     
     def __init__(self, config_path=None):
         """Initialize the hotkey manager."""
-        self.config_path = config_path or os.path.expanduser("~/.speechtotext/config.json")
-        self.hotkeys = {}
+        # Shared with SettingsManager, so saving hotkeys keeps every other setting
+        self.store = get_config_store(config_path)
+        self.config_path = self.store.path
         self.default_hotkey = "ctrl+alt+v"
         self.load_config()
-        self.pressed_keys = set()
+        self.engine = HotkeyEngine()
+        self.hook = None
+        
+    @property
+    def hotkeys(self):
+        """The configured hotkeys by action name."""
+        return self.store.get('hotkeys')
         
     def load_config(self):
-        """Load hotkey configuration from file."""
-        try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    if 'hotkeys' in config:
-                        self.hotkeys = config['hotkeys']
-                    else:
-                        self.hotkeys = {'activate': self.default_hotkey}
-            else:
-                # Create default configuration
-                self.hotkeys = {'activate': self.default_hotkey}
-                self.save_config()
-        except Exception as e:
-            print(f"Error loading hotkey configuration: {e}")
-            self.hotkeys = {'activate': self.default_hotkey}
+        """Load hotkey configuration, adding the default hotkey if there is none."""
+        if self.store.register_defaults({'hotkeys': {'activate': self.default_hotkey}}):
+            # Create default configuration
+            self.save_config()
             
     def save_config(self):
-        """Save hotkey configuration to file."""
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            
-            # Save configuration
-            with open(self.config_path, 'w') as f:
-                json.dump({'hotkeys': self.hotkeys}, f)
-                
-        except Exception as e:
-            print(f"Error saving hotkey configuration: {e}")
+        """Save hotkey configuration to file (debounced with other config changes)."""
+        self.store.mark_dirty()
             
     def register_hotkey(self, name, hotkey, on_press_callback, on_release_callback=None):
         """
         Register a global hotkey with press and release callbacks.
         
+        Any number of named hotkeys can be registered; they share one keyboard
+        hook, and registering a name again replaces its previous binding.
+        
         Args:
             name (str): Name of the hotkey action
             hotkey (str): The hotkey combination (e.g., 'ctrl+alt+v')
             on_press_callback (callable): Function to call when all keys are pressed
             on_release_callback (callable, optional): Function to call when any key is released
         """
-        if name in self.hotkeys:
-            # Remove existing hotkey if it exists
-            try:
-                keyboard.unhook_all()
-            except:
-                pass
-                
-        # Parse the hotkey combination
-        keys = hotkey.split('+')
-        
-        def on_key_event(e):
-            if e.event_type == keyboard.KEY_DOWN:
-                self.pressed_keys.add(e.name)
-                # Check if all required keys are pressed
-                if all(k in self.pressed_keys for k in keys):
-                    on_press_callback()
-            elif e.event_type == keyboard.KEY_UP:
-                if e.name in self.pressed_keys:
-                    self.pressed_keys.remove(e.name)
-                    if on_release_callback and any(k in keys for k in [e.name]):
-                        on_release_callback()
-        
-        # Register for all keys in the combination
         try:
-            for key in keys:
-                keyboard.on_press(on_key_event, suppress=True)
-                keyboard.on_release(on_key_event, suppress=True)
-                
-            self.hotkeys[name] = hotkey
-            self.save_config()
+            self.engine.add(HotkeyBinding(name, hotkey, on_press_callback, on_release_callback))
+            self._install_hook()
+            
+            if self.hotkeys.get(name) != hotkey:
+                self.store.set(hotkey, 'hotkeys', name)
             return True
         except Exception as e:
             print(f"Error registering hotkey: {e}")
             return False
             
+    def _install_hook(self):
+        """Install the single low-level hook shared by all bindings."""
+        if self.hook is None:
+            self.hook = keyboard.hook(self._on_key_event, suppress=True)
+            
+    def _on_key_event(self, event):
+        """Keyboard hook callback; runs for every keystroke system-wide."""
+        return self.engine.handle(event.event_type, event.name)
+            
     def unregister_hotkey(self, name):
         """Unregister a global hotkey."""
-        if name in self.hotkeys:
-            try:
-                keyboard.unhook_all()
-                return True
-            except Exception as e:
-                print(f"Error unregistering hotkey: {e}")
-                return False
-        return False
+        try:
+            return self.engine.remove(name)
+        except Exception as e:
+            print(f"Error unregistering hotkey: {e}")
+            return False
         
     def get_hotkey(self, name):
         """Get the current hotkey for a specific action."""
@@ -110,13 +223,14 @@ class HotkeyManager:
         
     def update_hotkey(self, name, key):
         """Update a hotkey configuration."""
-        self.hotkeys[name] = key
-        self.save_config()
+        self.store.set(key, 'hotkeys', name)
         
     def unregister_all(self):
         """Unregister all hotkeys."""
-        try:
-            keyboard.unhook_all()
-            self.pressed_keys.clear()
-        except:
-            pass
+        self.engine.clear()
+        if self.hook is not None:
+            try:
+                keyboard.unhook(self.hook)
+            except Exception:
+                pass
+            self.hook = None
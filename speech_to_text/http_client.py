@@ -0,0 +1,146 @@
+"""
+Shared HTTP clients for the Speech to Text application.
+One keep-alive connection pool per API endpoint, reused by every transcription.
+"""
+import threading
+import time
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+from speech_to_text import latency
+
+# Keep idle connections around between dictations instead of httpx's 5 second default
+KEEPALIVE_EXPIRY = 90.0
+POOL_LIMITS = httpx.Limits(
+    max_connections=32,
+    max_keepalive_connections=8,
+    keepalive_expiry=KEEPALIVE_EXPIRY
+)
+# The OpenAI client's own default; the server sends nothing until a long file is done.
+# Dictations get a much shorter per-request timeout from RetryPolicy's deadline.
+TIMEOUT = httpx.Timeout(600.0, connect=10.0)
+
+def _on_request(request):
+    """httpx hook: the request is about to be sent."""
+    latency.mark('request_sent')
+
+def _on_response(response):
+    """httpx hook: response headers arrived, so the upload and server processing are done."""
+    latency.since('upload', 'request_sent')
+    latency.mark('response_started')
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+class SharedClient:
+    """An OpenAI client and the connection pool it runs on."""
+
+    def __init__(self, api_key=None, base_url=None):
+        """Create the connection pool and the client on top of it."""
+        self.http_client = httpx.Client(
+            limits=POOL_LIMITS,
+            timeout=TIMEOUT,
+            # Per-stage timings for the dictation being transcribed on this thread, if any
+            event_hooks={'request': [_on_request], 'response': [_on_response]}
+        )
+        # Retries are handled by RetryPolicy, which also enforces the caller's deadline
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self.http_client,
+            max_retries=0
+        )
+        self.last_warm = 0.0
+        self.warm_lock = threading.Lock()
+
+    def warm_up(self, wait=False):
+        """
+        Open a connection to the API host so the next request skips TCP/TLS setup.
+
+        Args:
+            wait (bool): Block until the connection is up instead of warming in the background
+
+        Returns:
+            bool: True if a warm-up was started, False if the pool is still warm
+        """
+        # A connection opened recently is still in the pool
+        if time.monotonic() - self.last_warm < KEEPALIVE_EXPIRY / 2:
+            return False
+        self.last_warm = time.monotonic()
+
+        if wait:
+            self._open_connection()
+        else:
+            thread = threading.Thread(target=self._open_connection)
+            thread.daemon = True
+            thread.start()
+        return True
+
+    def _open_connection(self):
+        """Send a cheap unauthenticated request; the connection stays pooled."""
+        if not self.warm_lock.acquire(blocking=False):
+            return
+        try:
+            self.http_client.head(str(self.client.base_url))
+        except Exception as e:
+            # Warming is best effort; the real request will connect on its own
+            self.last_warm = 0.0
+            print(f"Connection warm-up failed: {e}")
+        finally:
+            self.warm_lock.release()
+
+def get_shared_client(api_key=None, base_url=None):
+    """
+    Return the process-wide client for an endpoint, creating it on first use.
+
+    Args:
+        api_key (str, optional): API key; defaults to OPENAI_API_KEY from the environment
+        base_url (str, optional): Base URL of an OpenAI-compatible server
+
+    Returns:
+        SharedClient: The shared client for this endpoint and key
+    """
+    key = (api_key, base_url)
+    with _clients_lock:
+        shared = _clients.get(key)
+        if shared is None:
+            shared = SharedClient(api_key=api_key, base_url=base_url)
+            _clients[key] = shared
+        return shared
+
+def create_async_client(api_key=None, base_url=None):
+    """
+    Create an async OpenAI client with the same pool settings as the shared clients.
+
+    Async connection pools belong to the event loop that uses them, so unlike
+    get_shared_client this returns a new client; keep one per loop and pass it
+    to close_with_loop.
+    """
+    http_client = httpx.AsyncClient(limits=POOL_LIMITS, timeout=TIMEOUT)
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=http_client,
+        max_retries=0
+    )
+
+async def close_with_loop(async_client):
+    """
+    Close an async client when the running event loop shuts down.
+
+    asyncio.run() finalizes the loop's async generators before closing it, so a
+    generator parked at its first yield gets to close the client's pool then.
+
+    Returns:
+        The parked generator; keep a reference to it while the client is in use,
+        or it is finalized (and the client closed) early
+    """
+    async def hold():
+        try:
+            yield
+        finally:
+            await async_client.close()
+
+    holder = hold()
+    await holder.__anext__()
+    return holder
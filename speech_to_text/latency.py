@@ -0,0 +1,203 @@
+"""
+Latency instrumentation for the Speech to Text application.
+Per-stage timings of each dictation, kept in histograms and optionally logged as JSON lines.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# Stages of one dictation, in the order they happen
+STAGES = (
+    'start',       # hotkey press -> input stream started
+    'recording',   # stream started -> hotkey released
+    'stop',        # stopping the stream and collecting the samples
+    'trim',        # trimming silence off the ends (VAD)
+    'encode',      # encoding for upload
+    'upload',      # request sent -> response headers (includes the server's processing)
+    'response',    # response headers -> parsed transcription
+    'transcribe',  # whole transcription call, retries included
+    'clipboard',   # copying the text to the clipboard
+    'paste',       # sending ctrl+v
+    'total',       # hotkey release -> text pasted
+)
+NETWORK_STAGES = ('upload', 'response')
+
+# Histogram bucket upper bounds in seconds; the last bucket is open-ended
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_local = threading.local()
+
+class DictationTrace:
+    """Timings of one dictation, filled in by whichever thread is handling it."""
+
+    def __init__(self):
+        """Start the trace at the hotkey press."""
+        self.pressed = time.perf_counter()
+        self.marks = {}
+        self.spans = {}
+        self.details = {}
+
+    def mark(self, name):
+        """Remember the current time under a name."""
+        self.marks[name] = time.perf_counter()
+
+    def since(self, stage, mark):
+        """Record the time from a mark until now as a stage; returns False if the mark is missing."""
+        start = self.marks.get(mark)
+        if start is None:
+            return False
+        self.add(stage, time.perf_counter() - start)
+        return True
+
+    def add(self, stage, seconds):
+        """Add time to a stage; stages hit more than once (retries) accumulate."""
+        self.spans[stage] = self.spans.get(stage, 0.0) + seconds
+
+    def note(self, name, value):
+        """Record a detail of the dictation that isn't a timing, e.g. the upload size."""
+        self.details[name] = value
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def to_dict(self):
+        """Return the trace as a JSON-serializable record, in milliseconds."""
+        record = {'time': time.time()}
+        record.update({stage: round(seconds * 1000, 1) for stage, seconds in self.spans.items()})
+        record.update(self.details)
+        network = sum(self.spans.get(stage, 0.0) for stage in NETWORK_STAGES)
+        total = self.spans.get('total')
+        if total:
+            record['network_share'] = round(network / total, 3)
+        return record
+
+@contextmanager
+def activate(trace):
+    """Make a trace current for this thread, so lower layers can add to it."""
+    previous = getattr(_local, 'trace', None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+def current():
+    """Return this thread's current trace, or None."""
+    return getattr(_local, 'trace', None)
+
+@contextmanager
+def span(stage):
+    """Time a block into the current trace; does nothing when there is none."""
+    trace = current()
+    if trace is None:
+        yield
+        return
+    with trace.span(stage):
+        yield
+
+def mark(name):
+    """Mark the current trace, if there is one."""
+    trace = current()
+    if trace is not None:
+        trace.mark(name)
+
+def since(stage, mark_name):
+    """Record a stage from a mark in the current trace, if there is one."""
+    trace = current()
+    if trace is not None:
+        trace.since(stage, mark_name)
+
+def note(name, value):
+    """Record a detail in the current trace, if there is one."""
+    trace = current()
+    if trace is not None:
+        trace.note(name, value)
+
+class StageHistogram:
+    """Bucket counts plus a window of recent samples for one stage."""
+
+    def __init__(self, window=500):
+        """Start empty."""
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.recent = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        """Add one sample."""
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+        self.count += 1
+
+    def percentile(self, percent):
+        """Return the given percentile of recent samples, or None without samples."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))]
+
+class LatencyStats:
+    """In-process latency histograms per stage, with an optional JSON-lines log."""
+
+    def __init__(self, log_path=None):
+        """
+        Initialize the stats.
+
+        Args:
+            log_path (str, optional): Append each finished trace to this file as a JSON line
+        """
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.log_path = os.path.abspath(os.path.expanduser(log_path)) if log_path else None
+        self.dictations = 0
+        self.network_bound = 0
+
+    def record(self, trace):
+        """Add a finished trace to the histograms and the log."""
+        record = trace.to_dict()
+        with self.lock:
+            for stage, seconds in trace.spans.items():
+                histogram = self.histograms.get(stage)
+                if histogram is None:
+                    histogram = self.histograms[stage] = StageHistogram()
+                histogram.record(seconds)
+            self.dictations += 1
+            if record.get('network_share', 0.0) >= 0.5:
+                self.network_bound += 1
+            if self.log_path:
+                self._append(record)
+
+    def summary(self):
+        """Return one line per stage with its count, median and 95th percentile."""
+        with self.lock:
+            if not self.dictations:
+                return "No dictations timed yet"
+            lines = []
+            ordered = [stage for stage in STAGES if stage in self.histograms]
+            ordered += sorted(stage for stage in self.histograms if stage not in STAGES)
+            for stage in ordered:
+                histogram = self.histograms[stage]
+                lines.append(
+                    f"{stage}: p50 {histogram.percentile(50) * 1000:.0f} ms, "
+                    f"p95 {histogram.percentile(95) * 1000:.0f} ms (n={histogram.count})"
+                )
+            lines.append(f"network-bound: {self.network_bound} of {self.dictations} dictations")
+            return "\n".join(lines)
+
+    def _append(self, record):
+        """Append one record to the log file."""
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+        except Exception as e:
+            print(f"Error writing latency log: {e}")
@@ -0,0 +1,112 @@
+"""
+Audio level meter for the Speech to Text application.
+The audio callback publishes levels into a shared ring; a Tk canvas polls and draws them.
+"""
+import tkinter as tk
+import numpy as np
+
+class LevelHistory:
+    """
+    A ring of recent RMS and peak levels shared between the audio and UI threads.
+
+    There is exactly one writer (the audio callback), which fills a slot and then
+    advances the counter; readers only look at slots behind the counter. No lock
+    is taken, so publishing never blocks the real-time thread.
+    """
+
+    def __init__(self, size=256):
+        """Preallocate room for the most recent `size` levels."""
+        self.size = size
+        self.rms = np.zeros(size, dtype=np.float32)
+        self.peak = np.zeros(size, dtype=np.float32)
+        self.count = 0
+
+    def publish(self, rms, peak):
+        """Record one level pair (audio thread). Values are on a 0..1 scale."""
+        index = self.count % self.size
+        self.rms[index] = rms
+        self.peak[index] = peak
+        self.count += 1
+
+    def latest(self):
+        """Return the most recent (rms, peak), or zeros before anything was published."""
+        count = self.count
+        if count == 0:
+            return 0.0, 0.0
+        index = (count - 1) % self.size
+        return float(self.rms[index]), float(self.peak[index])
+
+    def recent(self, n):
+        """Return the last n RMS and peak levels, oldest first, zero-padded at the start."""
+        count = self.count
+        n = min(n, self.size)
+        indices = np.arange(count - n, count) % self.size
+        rms = self.rms[indices]
+        peak = self.peak[indices]
+        if count < n:
+            rms[:n - count] = 0.0
+            peak[:n - count] = 0.0
+        return rms, peak
+
+class LevelMeter(tk.Canvas):
+    """A scrolling bar graph of recent levels, redrawn by a UI-thread poller."""
+
+    def __init__(self, parent, history, bars=100, fps=30, width=400, height=80,
+                 color='#3b82f6', peak_color='#93c5fd', background='white'):
+        """
+        Create the canvas and its bars; polling starts immediately.
+
+        Args:
+            parent (tk.Widget): Parent widget
+            history (LevelHistory): Levels published by the recorder
+            bars (int): Number of levels shown
+            fps (int): Redraw rate
+        """
+        super().__init__(parent, width=width, height=height, background=background,
+                         highlightthickness=0)
+        self.history = history
+        self.bars = bars
+        self.interval = max(1, int(1000 / fps))
+        self.seen = -1
+        self.after_id = None
+
+        # Items are created once; each frame only moves their coordinates
+        self.peak_items = [self.create_rectangle(0, 0, 0, 0, fill=peak_color, width=0)
+                           for _ in range(bars)]
+        self.rms_items = [self.create_rectangle(0, 0, 0, 0, fill=color, width=0)
+                          for _ in range(bars)]
+
+        self.bind('<Destroy>', self._on_destroy)
+        self._poll()
+
+    def _poll(self):
+        """Redraw if new levels arrived, then schedule the next frame."""
+        count = self.history.count
+        if count != self.seen:
+            self.seen = count
+            self._draw(*self.history.recent(self.bars))
+        self.after_id = self.after(self.interval, self._poll)
+
+    def _draw(self, rms, peak):
+        """Move the bars to the given levels."""
+        # Before the canvas is mapped its real size isn't known yet
+        if self.winfo_ismapped():
+            width, height = self.winfo_width(), self.winfo_height()
+        else:
+            width, height = int(self['width']), int(self['height'])
+        step = width / self.bars
+
+        # Levels are mostly far below full scale; a square root makes speech visible
+        rms_heights = np.sqrt(np.clip(rms, 0.0, 1.0)) * height
+        peak_heights = np.sqrt(np.clip(peak, 0.0, 1.0)) * height
+        for i in range(self.bars):
+            x0 = i * step
+            x1 = x0 + max(1.0, step - 1)
+            self.coords(self.peak_items[i], x0, height - peak_heights[i], x1, height)
+            self.coords(self.rms_items[i], x0, height - rms_heights[i], x1, height)
+
+    def _on_destroy(self, event):
+        """Stop polling when the widget goes away."""
+        if event.widget is self and self.after_id is not None:
+            self.after_cancel(self.after_id)
+            self.after_id = None
@@ -0,0 +1,119 @@
+"""
+Streaming sample-rate conversion for the Speech to Text application.
+Downmixes and resamples audio block by block as it is captured, using a polyphase FIR filter.
+"""
+from math import gcd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import firwin
+
+class StreamingResampler:
+    """
+    Converts blocks of multi-channel audio at one rate to mono at another.
+
+    Each call to process() returns every output sample whose inputs have
+    arrived, keeping just enough input history between calls for the filter.
+    Work per block is proportional to the block, so nothing is left to do
+    when the recording stops.
+    """
+
+    def __init__(self, input_rate, output_rate=16000, channels=1, dtype='float32'):
+        """
+        Design the filter for a rate pair.
+
+        Args:
+            input_rate (int): Sample rate of the captured audio
+            output_rate (int): Sample rate wanted downstream
+            channels (int): Channels in the captured audio; they are averaged to mono
+            dtype (str): Sample type of the output, 'float32' or 'int16'
+        """
+        input_rate = int(round(input_rate))
+        divisor = gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self.input_rate = input_rate
+        self.output_rate = output_rate
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.received = 0
+        self.produced = 0
+
+        # Equal rates only need the downmix
+        if self.up == self.down:
+            return
+
+        # Same anti-aliasing filter design as scipy.signal.resample_poly
+        max_rate = max(self.up, self.down)
+        half_length = 10 * max_rate
+        taps = firwin(2 * half_length + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * self.up
+
+        # Split into one sub-filter per phase, reversed so each output is a dot product
+        # with a window of consecutive inputs
+        per_phase = -(-len(taps) // self.up)
+        padded = np.zeros(per_phase * self.up)
+        padded[:len(taps)] = taps
+        self.phases = padded.reshape(per_phase, self.up).T[:, ::-1].astype(np.float32)
+        self.window = per_phase
+
+        # Outputs are aligned to the filter's center, so the stream isn't delayed
+        self.delay = half_length
+        self.history = np.zeros(self.window - 1, dtype=np.float32)
+        self.history_start = -(self.window - 1)
+
+    @property
+    def passthrough(self):
+        """True when the input already has the output's rate and is mono."""
+        return self.up == self.down and self.channels == 1
+
+    def process(self, block):
+        """
+        Convert one captured block.
+
+        Args:
+            block (numpy.ndarray): Frames of shape (frames, channels), float32 or int16
+
+        Returns:
+            numpy.ndarray: Converted mono frames of shape (frames, 1), possibly empty
+        """
+        if block.dtype == np.int16:
+            samples = block.astype(np.float32) / 32768.0
+        else:
+            samples = block.astype(np.float32, copy=False)
+        mono = samples.mean(axis=1) if samples.ndim == 2 and samples.shape[1] > 1 else samples.reshape(-1)
+
+        if self.up == self.down:
+            return self._output(mono)
+
+        self.history = np.concatenate((self.history, mono))
+        self.received += len(mono)
+
+        # Output n needs inputs up to (n * down + delay) // up
+        last = (self.received - 1) * self.up - self.delay
+        count = last // self.down + 1 - self.produced if last >= 0 else 0
+        if count <= 0:
+            return self._output(np.zeros(0, dtype=np.float32))
+
+        positions = (np.arange(self.produced, self.produced + count) * self.down) + self.delay
+        newest = positions // self.up
+        phase = positions % self.up
+
+        windows = sliding_window_view(self.history, self.window)
+        starts = newest - (self.window - 1) - self.history_start
+        output = np.einsum('ij,ij->i', windows[starts], self.phases[phase])
+        self.produced += count
+
+        # Keep only the history the next output will reach back to
+        next_newest = (self.produced * self.down + self.delay) // self.up
+        keep_from = next_newest - (self.window - 1) - self.history_start
+        if keep_from > 0:
+            self.history = self.history[keep_from:]
+            self.history_start += keep_from
+        return self._output(output)
+
+    def _output(self, mono):
+        """Shape and convert the converted samples for the recorder."""
+        if self.dtype == np.int16:
+            mono = np.clip(mono * 32768.0, -32768, 32767).astype(np.int16)
+        else:
+            mono = mono.astype(self.dtype, copy=False)
+        return mono.reshape(-1, 1)
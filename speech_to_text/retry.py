@@ -0,0 +1,268 @@
+"""
+Retry policy for the Speech to Text application.
+Deadlines, retries with exponential backoff and jitter, and hedged requests.
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import openai
+
+from speech_to_text import latency
+
+# HTTP status codes worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call does not succeed within its deadline."""
+
+def is_retryable(error):
+    """Return True if an error is transient and the request may be sent again."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+class LatencyTracker:
+    """Rolling window of recent request latencies."""
+
+    def __init__(self, size=100):
+        """Keep the most recent `size` samples."""
+        self.samples = deque(maxlen=size)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        """Add one latency sample."""
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, percent):
+        """Return the given percentile of recent latencies, or None with no samples."""
+        with self.lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(percent / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def __len__(self):
+        """Return the number of samples."""
+        return len(self.samples)
+
+class RetryPolicy:
+    """Runs a request with a deadline, retries and optional hedging."""
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, deadline=None,
+                 hedge=False, hedge_percentile=95, hedge_initial_delay=3.0,
+                 hedge_min_delay=0.5, min_samples=10):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts (int): Attempts per call, including the first
+            base_delay (float): Backoff before the first retry, doubled for each further retry
+            max_delay (float): Upper bound for a single backoff
+            deadline (float, optional): Seconds a call may take in total. None (the default)
+                sets no limit, as files can take arbitrarily long; the tray app passes
+                the short dictation deadline from its settings
+            hedge (bool): Send a duplicate request when the first one is slow
+            hedge_percentile (float): Latency percentile after which a request counts as slow
+            hedge_initial_delay (float): Hedging delay used until enough latencies are known
+            hedge_min_delay (float): Never hedge sooner than this
+            min_samples (int): Latencies needed before the percentile is trusted
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_initial_delay = hedge_initial_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self.executor = None
+        self.executor_lock = threading.Lock()
+
+    def backoff(self, attempt):
+        """Return the delay before retry number `attempt` (1-based), with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def hedge_delay(self):
+        """Return how long to wait for a request before sending its duplicate."""
+        if len(self.latencies) < self.min_samples:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, self.latencies.percentile(self.hedge_percentile))
+
+    def call(self, request, hedge=None):
+        """
+        Run a request under this policy.
+
+        Args:
+            request (callable): Called as request(timeout) with the seconds left before the
+                deadline (or None), and must be safe to call more than once
+            hedge (bool, optional): Override the policy's hedging setting for this call
+
+        Returns:
+            The request's result
+        """
+        hedge = self.hedge if hedge is None else hedge
+        expires = time.monotonic() + self.deadline if self.deadline else None
+
+        attempt = 1
+        while True:
+            remaining = self._remaining(expires)
+            try:
+                if hedge:
+                    return self._hedged(request, remaining)
+                return self._timed(request, remaining)
+            except Exception as e:
+                time.sleep(self._retry_delay(attempt, e, expires))
+                attempt += 1
+
+    async def call_async(self, request, hedge=None):
+        """
+        Run a coroutine-based request under this policy.
+
+        Args:
+            request (callable): Called as request(timeout) and returns an awaitable;
+                must be safe to call more than once
+            hedge (bool, optional): Override the policy's hedging setting for this call
+
+        Returns:
+            The request's result
+        """
+        hedge = self.hedge if hedge is None else hedge
+        expires = time.monotonic() + self.deadline if self.deadline else None
+
+        attempt = 1
+        while True:
+            remaining = self._remaining(expires)
+            try:
+                if hedge:
+                    return await self._hedged_async(request, remaining)
+                return await self._timed_async(request, remaining)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(attempt, e, expires))
+                attempt += 1
+
+    def _retry_delay(self, attempt, error, expires):
+        """Return the backoff before the next attempt, or re-raise if there is none."""
+        if attempt >= self.max_attempts or not is_retryable(error):
+            raise error
+
+        delay = self.backoff(attempt)
+        remaining = self._remaining(expires)
+        if remaining is not None and remaining <= delay:
+            raise DeadlineExceeded(f"Deadline of {self.deadline}s exceeded") from error
+
+        print(f"Transcription attempt {attempt} failed ({error}); retrying in {delay:.2f}s")
+        return delay
+
+    def _remaining(self, expires):
+        """Return the seconds left before the deadline, or None without one."""
+        if expires is None:
+            return None
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.deadline}s exceeded")
+        return remaining
+
+    def _timed(self, request, timeout):
+        """Run one request and record its latency on success."""
+        start = time.monotonic()
+        result = request(timeout)
+        self.latencies.record(time.monotonic() - start)
+        return result
+
+    def _get_executor(self):
+        """Create the pool used for hedged requests on first use."""
+        with self.executor_lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+            return self.executor
+
+    def _hedged(self, request, timeout):
+        """Send the request, and a duplicate if it is slow; return whichever succeeds first."""
+        executor = self._get_executor()
+        start = time.monotonic()
+        # The dictation trace is per thread; carry it over to the workers sending the request
+        trace = latency.current()
+
+        def time_left():
+            return None if timeout is None else max(0.0, timeout - (time.monotonic() - start))
+
+        def attempt(attempt_timeout):
+            with latency.activate(trace):
+                return self._timed(request, attempt_timeout)
+
+        futures = [executor.submit(attempt, timeout)]
+        delay = self.hedge_delay()
+        if timeout is not None:
+            delay = min(delay, timeout)
+
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            futures.append(executor.submit(attempt, time_left()))
+
+        error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=time_left(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded(f"Deadline of {self.deadline}s exceeded")
+            for future in done:
+                if future.exception() is None:
+                    # The slower duplicate finishes in the background and is ignored
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    async def _timed_async(self, request, timeout):
+        """Await one request within the time left and record its latency on success."""
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(request(timeout), timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline of {self.deadline}s exceeded")
+        self.latencies.record(time.monotonic() - start)
+        return result
+
+    async def _hedged_async(self, request, timeout):
+        """Async counterpart of _hedged; the losing request is cancelled."""
+        start = time.monotonic()
+
+        def time_left():
+            return None if timeout is None else max(0.0, timeout - (time.monotonic() - start))
+
+        tasks = [asyncio.ensure_future(self._timed_async(request, timeout))]
+        delay = self.hedge_delay()
+        if timeout is not None:
+            delay = min(delay, timeout)
+
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(self._timed_async(request, time_left())))
+
+        error = None
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=time_left(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise DeadlineExceeded(f"Deadline of {self.deadline}s exceeded")
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
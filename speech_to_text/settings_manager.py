@@ -2,15 +2,20 @@
 Settings manager for the Speech to Text application.
 Handles user preferences such as microphone selection, language, and hotkeys.
 """
-import json
-import os
+import copy
+
+from speech_to_text.config_store import get_config_store
+
+_MISSING = object()
 
 class SettingsManager:
     """Manages application settings."""
     
     def __init__(self, config_path=None):
         """Initialize the settings manager."""
-        self.config_path = config_path or os.path.expanduser("~/.speechtotext/config.json")
+        # Shared with HotkeyManager, so both see and save the same file
+        self.store = get_config_store(config_path)
+        self.config_path = self.store.path
         
         # Default settings
         self.default_settings = {
@@ -22,91 +27,93 @@ class SettingsManager:
             'hotkeys': {
                 'activate': 'ctrl+alt+v'
             },
+            'transcription': {
+                'engine': 'openai',  # 'openai', 'openai_compatible' or 'local'
+                'model': 'whisper-1',
+                'base_url': None,  # server URL for 'openai_compatible'
+                'max_concurrency': 2,  # parallel requests for 'openai_compatible'
+                'local_model_path': '~/.speechtotext/models/whisper',  # faster-whisper model for 'local'
+                'upload_format': 'auto'  # 'auto', 'wav', 'wav16', 'flac' or 'opus'
+            },
+            'network': {
+                'prewarm_on_hotkey': True,  # open the API connection while the user speaks
+                'deadline': 30,  # seconds before a dictation gives up, retries included (files have no deadline)
+                'max_attempts': 3,  # retries on timeouts, rate limits and server errors
+                'hedge': False  # send a duplicate request when the first is slower than usual
+            },
             'output': {
                 'paste_directly': True,
                 'copy_to_clipboard': True
             },
             'recording': {
-                'max_duration': 30  # seconds
+                'max_duration': 30,  # seconds
+                'streaming': True,  # transcribe segments while still recording
+                'trim_silence': True,  # trim dead air and skip silent captures
+                'keep_stream_open': False,  # keep the microphone open so recording starts instantly
+                'preroll': 0.3,  # seconds from before the key press included when kept open
+                'idle_close_after': 300,  # seconds idle before a kept-open microphone is closed
+                'native_capture': True,  # record at the device's own rate and convert while recording
+                'mode': 'hold',  # 'hold' (record while the hotkey is held) or 'toggle' (press to start, stops on a pause)
+                'auto_endpoint': False,  # in hold mode, transcribe on a pause without waiting for the key release
+                'endpoint_silence': 0.8  # seconds of silence after speech that end a dictation
+            },
+            'diagnostics': {
+                'latency_log': None  # e.g. '~/.speechtotext/latency.jsonl' to log per-stage timings
             }
         }
         
-        self.settings = self.default_settings.copy()
-        self.load_settings()
+        if self.store.register_defaults(self.default_settings):
+            # Create default settings file
+            self.save_settings()
+            
+    @property
+    def settings(self):
+        """The current settings, shared with every other user of the config file."""
+        return self.store.data
         
     def load_settings(self):
-        """Load settings from file."""
-        try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    loaded_settings = json.load(f)
-                    
-                    # Update settings with loaded values while preserving structure
-                    # and adding any new default settings
-                    self._update_dict_recursively(self.settings, loaded_settings)
-            else:
-                # Create default settings file
-                self.save_settings()
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-            
-    def _update_dict_recursively(self, target, source):
-        """Update a dictionary recursively, maintaining structure."""
-        for key, value in source.items():
-            if key in target and isinstance(target[key], dict) and isinstance(value, dict):
-                self._update_dict_recursively(target[key], value)
-            else:
-                target[key] = value
-                
+        """Reload settings from file."""
+        self.store.load()
+        
     def save_settings(self):
-        """Save settings to file."""
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            
-            # Save settings
-            with open(self.config_path, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error saving settings: {e}")
-            
+        """Save settings to file now, rather than after the usual short delay."""
+        self.store.mark_dirty()
+        self.store.flush()
+        
+    def batch(self):
+        """
+        Group several set_setting calls into one write.
+        
+        Usage:
+            with settings_manager.batch():
+                settings_manager.set_setting(...)
+                settings_manager.set_setting(...)
+        """
+        return self.store.batch()
+        
     def get_setting(self, *keys):
         """Get a setting value using dot notation."""
-        current = self.settings
-        for key in keys:
-            if key in current:
-                current = current[key]
-            else:
-                # Return default if key doesn't exist
-                current = self.default_settings
-                for k in keys:
-                    if k in current:
-                        current = current[k]
-                    else:
-                        return None
-                break
-        return current
+        value = self.store.get(*keys, default=_MISSING)
+        if value is _MISSING:
+            # Return default if key doesn't exist
+            current = self.default_settings
+            for key in keys:
+                if isinstance(current, dict) and key in current:
+                    current = current[key]
+                else:
+                    return None
+            return current
+        return value
         
     def set_setting(self, value, *keys):
-        """Set a setting value using dot notation."""
-        # Navigate to the parent of the final key
-        current = self.settings
-        for key in keys[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
-            
-        # Set the value at the final key
-        current[keys[-1]] = value
-        
-        # Save the updated settings
-        self.save_settings()
+        """Set a setting value using dot notation; saved shortly after, together with other changes."""
+        self.store.set(value, *keys)
         
     def reset_to_defaults(self):
         """Reset all settings to default values."""
-        self.settings = self.default_settings.copy()
-        self.save_settings()
+        # Deep copy, so later changes never alias the nested defaults
+        self.store.replace(copy.deepcopy(self.default_settings))
+        self.store.flush()
         
     def get_available_languages(self):
         """Return a list of available languages for transcription."""
@@ -0,0 +1,113 @@
+"""
+Streaming transcription for the Speech to Text application.
+Transcribes finished utterance segments in the background while recording continues.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from speech_to_text.vad import trim_silence
+
+class StreamingSession:
+    """The segments of one dictation, transcribed in the background."""
+
+    def __init__(self, transcriber, language=None, trim=True):
+        """
+        Initialize the session.
+
+        Args:
+            transcriber (StreamingTranscriber): Owner of the worker pool
+            language (str, optional): Language code for every segment
+            trim (bool): Trim silence from each segment and skip silent ones
+        """
+        self.transcriber = transcriber
+        self.language = language
+        self.trim = trim
+        self.futures = []
+        self.lock = threading.Lock()
+
+    def submit_segment(self, audio_data):
+        """
+        Queue a finished segment for transcription.
+
+        Safe to call from the audio callback: the samples are only encoded
+        and uploaded on a worker thread.
+
+        Args:
+            audio_data (numpy.ndarray): Recorded samples making up the segment
+        """
+        future = self.transcriber.executor.submit(
+            self.transcriber.transcribe_segment, audio_data, self.language, self.trim
+        )
+        with self.lock:
+            self.futures.append(future)
+
+    def pending_count(self):
+        """Return the number of segments submitted so far."""
+        with self.lock:
+            return len(self.futures)
+
+    def finish(self, tail_audio=None):
+        """
+        Transcribe the final tail and join it with the segment results.
+
+        Args:
+            tail_audio (numpy.ndarray, optional): Samples recorded after the last segment
+
+        Returns:
+            str: The transcribed text of the whole dictation, in spoken order
+        """
+        with self.lock:
+            futures = list(self.futures)
+
+        # The tail is uploaded while earlier segments may still be in flight
+        tail_text = None
+        if tail_audio is not None:
+            tail_text = self.transcriber.transcribe_segment(tail_audio, self.language, self.trim)
+
+        texts = [future.result() for future in futures]
+        texts.append(tail_text)
+        return " ".join(text.strip() for text in texts if text and text.strip())
+
+class StreamingTranscriber:
+    """Transcribes recorded segments in the background and joins the results in order."""
+
+    def __init__(self, transcription_service, sample_rate=16000, max_workers=2):
+        """
+        Initialize the streaming transcriber.
+
+        Args:
+            transcription_service (TranscriptionService): Service used for each segment
+            sample_rate (int): Sample rate of the recorded chunks
+            max_workers (int): Maximum number of segments transcribed at once
+        """
+        self.transcription_service = transcription_service
+        self.sample_rate = sample_rate
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="segment")
+
+    def begin(self, language=None, trim=True):
+        """
+        Start a new dictation.
+
+        Each dictation gets its own session, so one can still be finishing
+        while the next is recording.
+
+        Args:
+            language (str, optional): Language code for every segment
+            trim (bool): Trim silence from each segment and skip silent ones
+
+        Returns:
+            StreamingSession: Receives the dictation's segments
+        """
+        return StreamingSession(self, language=language, trim=trim)
+
+    def shutdown(self):
+        """Stop the worker threads without waiting for pending segments."""
+        self.executor.shutdown(wait=False)
+
+    def transcribe_segment(self, audio_data, language, trim):
+        """Encode and transcribe one segment, skipping it if it is silent."""
+        if trim:
+            audio_data = trim_silence(audio_data, self.sample_rate)
+            if audio_data is None:
+                return ""
+        return self.transcription_service.transcribe_audio(audio_data, self.sample_rate, language=language)
@@ -0,0 +1,303 @@
+"""
+Background transcription jobs for the Speech to Text web service.
+Uploads are queued in SQLite and transcribed chunk by chunk, publishing progress as they go.
+"""
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+
+# Job states; 'done' and 'failed' are final
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINAL_STATES = (DONE, FAILED)
+
+class JobStore:
+    """Persistent record of transcription jobs, so a restart doesn't lose queued work."""
+
+    def __init__(self, path=None):
+        """
+        Initialize the store.
+
+        Args:
+            path (str, optional): SQLite database file; defaults to ~/.speechtotext/jobs.sqlite3
+        """
+        self.path = path or os.path.expanduser("~/.speechtotext/jobs.sqlite3")
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def _connect(self):
+        """Open the database on first use."""
+        if self.connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " status TEXT NOT NULL,"
+                " file_path TEXT NOT NULL,"
+                " filename TEXT NOT NULL,"
+                " language TEXT,"
+                " text TEXT NOT NULL DEFAULT '',"
+                " done INTEGER NOT NULL DEFAULT 0,"
+                " total INTEGER,"
+                " error TEXT,"
+                " seq INTEGER NOT NULL DEFAULT 0,"
+                " created REAL NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created)"
+            )
+            self.connection.commit()
+        return self.connection
+
+    def add(self, job_id, file_path, filename, language=None):
+        """Record a new queued job and return it."""
+        now = time.time()
+        with self.lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT INTO jobs (id, status, file_path, filename, language, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, file_path, filename, language, now, now)
+            )
+            connection.commit()
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """Return a job as a dict, or None if there is no such job."""
+        with self.lock:
+            row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def update(self, job_id, **fields):
+        """Change some fields of a job and bump its sequence number; returns the new number."""
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self.lock:
+            connection = self._connect()
+            connection.execute(
+                f"UPDATE jobs SET {assignments}, seq = seq + 1, updated = ? WHERE id = ?",
+                (*fields.values(), time.time(), job_id)
+            )
+            connection.commit()
+            return connection.execute("SELECT seq FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+
+    def claim(self):
+        """Mark the oldest queued job as running and return it, or None if nothing is queued."""
+        with self.lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = ?, seq = seq + 1, updated = ? WHERE id = ?",
+                (RUNNING, time.time(), row['id'])
+            )
+            connection.commit()
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+        return dict(row)
+
+    def requeue_running(self):
+        """Put jobs that were running when the process stopped back in the queue; returns how many."""
+        with self.lock:
+            connection = self._connect()
+            count = connection.execute(
+                "UPDATE jobs SET status = ?, text = '', done = 0, total = NULL,"
+                " seq = seq + 1, updated = ? WHERE status = ?",
+                (QUEUED, time.time(), RUNNING)
+            ).rowcount
+            connection.commit()
+        return count
+
+    def count_pending(self):
+        """Return the number of jobs queued or running."""
+        with self.lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+
+    def prune(self, before):
+        """Delete finished jobs last updated before the given time; returns how many."""
+        with self.lock:
+            connection = self._connect()
+            count = connection.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated < ?", (*FINAL_STATES, before)
+            ).rowcount
+            connection.commit()
+        return count
+
+class JobQueue:
+    """Worker threads that transcribe stored jobs in the order they were submitted."""
+
+    def __init__(self, store, chunker, workers=2, files_dir=None, keep_days=7):
+        """
+        Initialize the queue; call start() to begin working.
+
+        Args:
+            store (JobStore): Where jobs are recorded
+            chunker (ChunkedTranscriber): Transcribes each file, reporting progress per chunk
+            workers (int): Jobs transcribed at once
+            files_dir (str, optional): Where queued uploads are kept; defaults to ~/.speechtotext/jobs
+            keep_days (float): Finished jobs older than this are deleted at start
+        """
+        self.store = store
+        self.chunker = chunker
+        self.workers = workers
+        self.files_dir = files_dir or os.path.expanduser("~/.speechtotext/jobs")
+        self.keep_days = keep_days
+        self.condition = threading.Condition()
+        # Latest sequence number of each running job; dropped when the job finishes
+        self.seqs = {}
+        self.running = 0
+        self.closing = False
+        self.threads = []
+
+    def start(self):
+        """Recover jobs interrupted by a restart and start the worker threads."""
+        os.makedirs(self.files_dir, exist_ok=True)
+        recovered = self.store.requeue_running()
+        if recovered:
+            print(f"Requeued {recovered} interrupted transcription jobs")
+        self.store.prune(time.time() - self.keep_days * 86400)
+
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}")
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, file_path, filename, language=None):
+        """
+        Queue an uploaded file for transcription and return immediately.
+
+        Args:
+            file_path (str): The spooled upload; it is moved into the queue's folder
+            filename (str): Name the client uploaded it under
+            language (str, optional): Language code (e.g., 'en', 'vi')
+
+        Returns:
+            dict: The new job
+        """
+        job_id = uuid.uuid4().hex
+        destination = os.path.join(self.files_dir, job_id + os.path.splitext(filename)[1].lower())
+        shutil.move(file_path, destination)
+        job = self.store.add(job_id, destination, filename, language)
+        with self.condition:
+            self.condition.notify_all()
+        return job
+
+    def pending_count(self):
+        """Return the number of jobs queued or running."""
+        return self.store.count_pending()
+
+    def get(self, job_id):
+        """Return a job, or None if there is no such job."""
+        return self.store.get(job_id)
+
+    def wait(self, job_id, seq, timeout=30.0):
+        """
+        Wait until a job changes from the given sequence number.
+
+        Returns:
+            dict: The job, changed or not, or None if there is no such job
+        """
+        with self.condition:
+            # Read under the condition so a job can't finish unnoticed before we wait
+            job = self.store.get(job_id)
+            if job is None or job['seq'] != seq or job['status'] in FINAL_STATES:
+                return job
+
+            # A job this queue is running leaves seqs when it finishes
+            tracked = job_id in self.seqs
+            self.condition.wait_for(
+                lambda: (
+                    self.closing
+                    or self.seqs.get(job_id, seq) != seq
+                    or (tracked and job_id not in self.seqs)
+                ),
+                timeout
+            )
+        return self.store.get(job_id)
+
+    def close(self, timeout=None):
+        """
+        Stop taking jobs and wait for the running ones to finish.
+
+        Jobs still running after the timeout are left as they are and
+        start over when the queue is next started.
+
+        Returns:
+            bool: True if no job was left running
+        """
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+            return self.condition.wait_for(lambda: self.running == 0, timeout)
+
+    def _work(self):
+        """Take queued jobs one at a time until the queue is closed."""
+        while True:
+            with self.condition:
+                if self.closing:
+                    return
+                try:
+                    job = self.store.claim()
+                except sqlite3.Error as e:
+                    print(f"Error reading transcription jobs: {e}")
+                    job = None
+                if job is None:
+                    # Submit wakes us up; the timeout covers jobs added by another process
+                    self.condition.wait(1.0)
+                    continue
+                self.running += 1
+                self.seqs[job['id']] = job['seq']
+                self.condition.notify_all()
+
+            try:
+                self._run(job)
+            finally:
+                with self.condition:
+                    self.running -= 1
+                    self.condition.notify_all()
+
+    def _run(self, job):
+        """Transcribe one job, recording partial text after every chunk."""
+        job_id = job['id']
+
+        def on_progress(text, done, total):
+            self._update(job_id, text=text, done=done, total=total)
+
+        try:
+            text = self.chunker.transcribe_file(
+                job['file_path'], language=job['language'], on_progress=on_progress
+            )
+        except Exception as e:
+            print(f"Error transcribing job {job_id}: {e}")
+            self._update(job_id, status=FAILED, error=str(e))
+        else:
+            latest = self.store.get(job_id)
+            total = latest['total'] or 1
+            self._update(job_id, status=DONE, text=text, done=total, total=total)
+
+        try:
+            os.remove(job['file_path'])
+        except OSError as e:
+            print(f"Error removing job file {job['file_path']}: {e}")
+
+    def _update(self, job_id, **fields):
+        """Store a change to a job and wake up anyone waiting on it."""
+        seq = self.store.update(job_id, **fields)
+        with self.condition:
+            if fields.get('status') in FINAL_STATES:
+                self.seqs.pop(job_id, None)
+            else:
+                self.seqs[job_id] = seq
+            self.condition.notify_all()
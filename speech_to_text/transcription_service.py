@@ -1,29 +1,64 @@
 """
 Transcription service for the Speech to Text application.
-Handles communication with the OpenAI API for audio transcription.
+Handles audio transcription through a pluggable engine (OpenAI's Whisper API by default).
 """
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from speech_to_text import latency
+from speech_to_text.audio_encoding import AudioEncoder
+from speech_to_text.engines import create_engine
+from speech_to_text.retry import RetryPolicy
+from speech_to_text.vad import to_mono_float
+
 class TranscriptionService:
-    """Handles audio transcription using OpenAI's Whisper API."""
+    """Handles audio transcription using OpenAI's Whisper API or another engine."""
     
-    def __init__(self):
-        """Initialize the transcription service."""
+    def __init__(self, upload_format='auto', engine=None, cache=None, retry_policy=None):
+        """
+        Initialize the transcription service.
+        
+        Args:
+            upload_format (str): Encoding used for recorded audio ('auto', 'wav', 'wav16', 'flac', 'opus')
+            engine (TranscriptionEngine, optional): Backend to use; defaults to the OpenAI API
+            cache (TranscriptionCache, optional): Result cache checked before uploading
+            retry_policy (RetryPolicy, optional): Deadline, retry and hedging policy for each request
+        """
         # Load environment variables
         load_dotenv()
         
-        # Initialize OpenAI client - it will automatically use OPENAI_API_KEY from env
-        self.client = OpenAI()
+        # The OpenAI engine will automatically use OPENAI_API_KEY from env
+        self.engine = engine or create_engine()
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        
+        # Encoder for recorded audio
+        self.encoder = AudioEncoder(upload_format)
+        
+    @property
+    def max_concurrency(self):
+        """Return how many requests may be in flight at once for this engine."""
+        if not self.engine.thread_safe:
+            return 1
+        return self.engine.max_concurrency
         
-    def transcribe_audio_file(self, file_path, language=None):
+    def warm_up(self):
+        """Warm the engine's connection ahead of a request; returns immediately."""
+        try:
+            return self.engine.warm_up()
+        except Exception as e:
+            print(f"Error warming up transcription engine: {e}")
+            return False
+        
+    def transcribe_audio_file(self, file_path, language=None, prompt=None, use_cache=True):
         """
-        Transcribe an audio file using OpenAI's Whisper API.
+        Transcribe an audio file.
         
         Args:
             file_path (str): Path to the audio file
             language (str, optional): Language code (e.g., 'en', 'vi')
+            prompt (str, optional): Text to guide the model's style or vocabulary
+            use_cache (bool): Set to False to bypass the cache and always upload
             
         Returns:
             str: Transcribed text
@@ -33,17 +68,101 @@ class TranscriptionService:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Audio file not found: {file_path}")
             
-            # Open and transcribe the audio file
+            # Read the file once; the same bytes are hashed for the cache and uploaded
             with open(file_path, "rb") as audio_file:
-                # Create transcription request
-                transcription = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language=language if language else None
-                )
+                audio = audio_file.read()
                 
-                return transcription.text
+            return self._transcribe_cached(audio, os.path.basename(file_path), language, prompt, use_cache)
+                
+        except Exception as e:
+            print(f"Error during transcription: {e}")
+            raise
+            
+    def file_cache_key(self, file_path, language=None, prompt=None):
+        """
+        Return the cache key transcribe_audio_file would use for a file, without reading it into memory.
+        
+        Returns:
+            str: The key, or None when there is no cache
+        """
+        if self.cache is None:
+            return None
+        return self.cache.make_file_key(file_path, self.engine.describe(), language, prompt)
+        
+    def transcribe_audio_bytes(self, audio, language=None, filename="audio.wav", prompt=None, use_cache=True):
+        """
+        Transcribe in-memory audio.
+        
+        Args:
+            audio (bytes or file-like): Encoded audio, e.g. an AudioEncoder result's data
+            language (str, optional): Language code (e.g., 'en', 'vi')
+            filename (str): Name sent with the upload; its extension tells the API the format
+            prompt (str, optional): Text to guide the model's style or vocabulary
+            use_cache (bool): Set to False to bypass the cache and always upload
+            
+        Returns:
+            str: Transcribed text
+        """
+        try:
+            if hasattr(audio, "read"):
+                audio = audio.read()
                 
+            return self._transcribe_cached(audio, filename, language, prompt, use_cache)
+            
         except Exception as e:
             print(f"Error during transcription: {e}")
             raise
+            
+    def transcribe_audio(self, audio_data, sample_rate, language=None):
+        """
+        Encode recorded samples in the configured upload format and transcribe them.
+        
+        Engines that take raw samples (the local engine) skip the encoding step.
+        The upload's format and size are noted in the current dictation trace.
+        
+        Args:
+            audio_data (numpy.ndarray): Recorded samples
+            sample_rate (int): Sample rate of the recording
+            language (str, optional): Language code (e.g., 'en', 'vi')
+            
+        Returns:
+            str: Transcribed text
+        """
+        if self.engine.accepts_samples:
+            return self.engine.transcribe_samples(to_mono_float(audio_data), sample_rate, language=language)
+            
+        with latency.span('encode'):
+            encoded = self.encoder.encode(audio_data, sample_rate)
+        latency.note('upload_format', encoded.format)
+        latency.note('upload_bytes', encoded.size)
+        
+        return self.transcribe_audio_bytes(encoded.data, language=language, filename=encoded.filename)
+        
+    def _transcribe_cached(self, audio, filename, language, prompt, use_cache):
+        """Return a cached result for identical audio and options, or transcribe and store it."""
+        if self.cache is None or not use_cache:
+            return self._create_transcription((filename, audio), language, prompt)
+            
+        key = self.cache.make_key(audio, self.engine.describe(), language, prompt)
+        text = self.cache.get(key)
+        if text is not None:
+            return text
+            
+        text = self._create_transcription((filename, audio), language, prompt)
+        self.cache.put(key, text)
+        return text
+        
+    def _create_transcription(self, file, language, prompt=None):
+        """
+        Send a transcription request to the engine under the retry policy.
+        
+        The payload is already encoded, so retries and hedged duplicates reuse it.
+        Hedging only applies to engines that can run requests concurrently.
+        """
+        def request(timeout):
+            text = self.engine.transcribe(file, language=language, prompt=prompt, timeout=timeout)
+            # The HTTP client marks when the response headers arrived
+            latency.since('response', 'response_started')
+            return text
+            
+        return self.retry_policy.call(request, hedge=self.retry_policy.hedge and self.engine.thread_safe)
@@ -0,0 +1,729 @@
+"""
+System tray application for the Speech to Text application.
+Records while the hotkey is held (or from one press until a pause) and pastes the transcription.
+"""
+import functools
+import importlib
+import threading
+import time
+import keyboard
+
+# Only what the hotkey needs is imported up front; audio, networking and GUI
+# modules are loaded by the warm start once the hotkey is live
+from speech_to_text.settings_manager import SettingsManager
+from speech_to_text.hotkey_manager import HotkeyManager
+from speech_to_text import latency
+
+class SpeechToTextTrayApp:
+    """The main application that runs in the system tray."""
+    
+    def __init__(self):
+        """Initialize the application and make the hotkey live."""
+        self.started = time.perf_counter()
+        
+        # Initialize managers
+        self.settings_manager = SettingsManager()
+        self.hotkey_manager = HotkeyManager()
+        
+        # Created by the warm start; wait for `ready` before using them
+        self.voice_recorder = None
+        self.transcription_service = None
+        self.streaming_transcriber = None
+        self.dictation_queue = None
+        self.tray_icon = None
+        self.ready = threading.Event()
+        self.startup_error = None
+        
+        # Recording state, shared by the hotkey, audio and worker threads
+        self.is_recording = False
+        self.streaming_session = None
+        self.recording_language = None
+        self.state_lock = threading.Lock()
+        
+        # Cleared while a hotkey is held; pasting waits for it, since a synthesized
+        # ctrl+v would combine with the held keys
+        self.hotkey_released = threading.Event()
+        self.hotkey_released.set()
+        self.settings_window = None
+        
+        # Where the time goes in each dictation, from hotkey press to paste
+        self.trace = None
+        self.latency_stats = latency.LatencyStats(
+            log_path=self.settings_manager.get_setting('diagnostics', 'latency_log')
+        )
+        
+        # Register the global hotkey with press and release callbacks
+        activate_hotkey = self.settings_manager.get_setting('hotkeys', 'activate')
+        self.hotkey_manager.register_hotkey(
+            'activate',
+            activate_hotkey,
+            self.on_hotkey_press,
+            self.on_hotkey_release
+        )
+        
+        # Extra 'dictate_<language>' hotkeys record in that language, e.g. "dictate_vi": "ctrl+alt+n"
+        hotkeys = self.settings_manager.get_setting('hotkeys') or {}
+        for name, hotkey in hotkeys.items():
+            if name.startswith('dictate_') and hotkey:
+                self.hotkey_manager.register_hotkey(
+                    name,
+                    hotkey,
+                    functools.partial(self.on_hotkey_press, language=name[len('dictate_'):]),
+                    self.on_hotkey_release
+                )
+                
+        print(f"Hotkey ready in {(time.perf_counter() - self.started) * 1000:.0f} ms")
+        
+    def run(self):
+        """Run the application."""
+        # Start the system tray icon
+        from speech_to_text.tray_icon import SystemTrayIcon
+        self.tray_icon = SystemTrayIcon(
+            show_window_callback=self.show_settings,
+            exit_callback=self.exit_app,
+            latency_callback=self.show_latency
+        )
+        self.tray_icon.run()
+        
+        # Load the rest in the background so the tray and hotkey respond right away
+        thread = threading.Thread(target=self.warm_start, name="warm-start")
+        thread.daemon = True
+        thread.start()
+        
+    def warm_start(self):
+        """Import and create the audio and transcription stack (runs in the background)."""
+        try:
+            from speech_to_text.voice_capture import VoiceRecorder
+            from speech_to_text.transcription_service import TranscriptionService
+            from speech_to_text.engines import create_engine
+            from speech_to_text.retry import RetryPolicy
+            from speech_to_text.streaming import StreamingTranscriber
+            from speech_to_text.dictation_queue import DictationQueue
+            
+            self.voice_recorder = VoiceRecorder(
+                keep_warm=self.settings_manager.get_setting('recording', 'keep_stream_open'),
+                preroll=self.settings_manager.get_setting('recording', 'preroll'),
+                idle_timeout=self.settings_manager.get_setting('recording', 'idle_close_after'),
+                native_capture=self.settings_manager.get_setting('recording', 'native_capture')
+            )
+            self.transcription_service = TranscriptionService(
+                upload_format=self.settings_manager.get_setting('transcription', 'upload_format'),
+                engine=create_engine(self.settings_manager.get_setting('transcription')),
+                retry_policy=RetryPolicy(
+                    max_attempts=self.settings_manager.get_setting('network', 'max_attempts'),
+                    deadline=self.settings_manager.get_setting('network', 'deadline'),
+                    hedge=self.settings_manager.get_setting('network', 'hedge')
+                )
+            )
+            self.streaming_transcriber = StreamingTranscriber(
+                self.transcription_service,
+                sample_rate=self.voice_recorder.sample_rate,
+                max_workers=min(2, self.transcription_service.max_concurrency)
+            )
+            
+            # Finished recordings are transcribed off the hotkey thread and pasted in order
+            self.dictation_queue = DictationQueue(
+                on_result=self.paste_result,
+                on_error=self.report_error,
+                max_workers=max(1, min(4, self.transcription_service.max_concurrency))
+            )
+            
+            # Modules only needed per dictation are imported now rather than on first use
+            for module in ('pyperclip', 'speech_to_text.vad'):
+                importlib.import_module(module)
+        except Exception as e:
+            # Remembered so every later hotkey press can report it right away
+            self.startup_error = e
+            print(f"Error during startup: {e}")
+            self.tray_icon.notify("Error", f"Failed to start: {str(e)}")
+            return
+            
+        # A warm microphone makes even the first recording start without device work
+        if self.voice_recorder.keep_warm:
+            try:
+                self.voice_recorder.open_stream(self.settings_manager.get_setting('microphone', 'device_id'))
+            except Exception as e:
+                print(f"Could not open the microphone ahead of time: {e}")
+                
+        self.ready.set()
+        print(f"Warm start finished in {(time.perf_counter() - self.started) * 1000:.0f} ms")
+        
+        # Open the API connection early so the first dictation doesn't pay for it
+        if self.settings_manager.get_setting('network', 'prewarm_on_hotkey'):
+            self.transcription_service.warm_up()
+            
+    def on_hotkey_press(self, language=None):
+        """
+        Start a dictation, or in toggle mode stop the one in progress.
+        
+        Args:
+            language (str, optional): Language for this dictation; defaults to the configured one
+        """
+        self.hotkey_released.clear()
+        if self.settings_manager.get_setting('recording', 'mode') == 'toggle' and self.is_recording:
+            self.stop_and_paste()
+            return
+        self.start_recording(language=language)
+        
+    def on_hotkey_release(self):
+        """Stop the dictation on key-up, except in toggle mode where a pause ends it."""
+        self.hotkey_released.set()
+        if self.settings_manager.get_setting('recording', 'mode') != 'toggle':
+            self.stop_and_paste()
+            
+    def start_recording(self, language=None):
+        """
+        Start recording when hotkey is pressed.
+        
+        Args:
+            language (str, optional): Language for this dictation; defaults to the configured one
+        """
+        trace = latency.DictationTrace()
+        
+        # This runs inside the suppressing keyboard hook, so it must never block
+        if not self.check_ready():
+            return
+            
+        with self.state_lock:
+            if self.is_recording:
+                return
+            self.is_recording = True
+            self.recording_language = language or self.settings_manager.get_setting('language')
+            self.trace = trace
+            
+        try:
+            # Warm the API connection so TCP/TLS setup overlaps with speaking
+            if self.settings_manager.get_setting('network', 'prewarm_on_hotkey'):
+                self.transcription_service.warm_up()
+                
+            # Get the microphone device from settings
+            device_id = self.settings_manager.get_setting('microphone', 'device_id')
+            
+            # In toggle mode, or with auto-endpointing, a pause after speech ends the dictation
+            toggle = self.settings_manager.get_setting('recording', 'mode') == 'toggle'
+            endpointing = toggle or self.settings_manager.get_setting('recording', 'auto_endpoint')
+            
+            # Update UI to show recording state
+            self.tray_icon.update_icon(recording=True, levels=self.voice_recorder.levels)
+            if toggle:
+                self.tray_icon.notify("Recording", "Speaking... Pause or press hotkey again to stop")
+            else:
+                self.tray_icon.notify("Recording", "Speaking... Release hotkey to stop")
+            
+            # In streaming mode, finished segments are transcribed while recording continues
+            on_segment = None
+            self.streaming_session = None
+            if self.settings_manager.get_setting('recording', 'streaming'):
+                trim = self.settings_manager.get_setting('recording', 'trim_silence')
+                self.streaming_session = self.streaming_transcriber.begin(
+                    language=self.recording_language,
+                    trim=trim
+                )
+                on_segment = self.streaming_session.submit_segment
+            
+            # Start recording, auto-submitting when the maximum duration is reached
+            max_duration = self.settings_manager.get_setting('recording', 'max_duration')
+            self.voice_recorder.start_recording(
+                device_id=device_id,
+                on_segment=on_segment,
+                max_duration=max_duration,
+                on_limit=self.on_max_duration,
+                on_endpoint=self.on_endpoint if endpointing else None,
+                endpoint_silence=self.settings_manager.get_setting('recording', 'endpoint_silence')
+            )
+            trace.add('start', time.perf_counter() - trace.pressed)
+            trace.mark('stream_started')
+            
+        except Exception as e:
+            self.tray_icon.notify("Error", f"Failed to start recording: {str(e)}")
+            with self.state_lock:
+                self.is_recording = False
+            self.tray_icon.update_icon(recording=False)
+            
+    def check_ready(self):
+        """
+        Return True if the warm start has finished, otherwise tell the user why not.
+        
+        Never waits, since callers include the keyboard hook and the tray menu.
+        """
+        if self.ready.is_set():
+            return True
+        if self.tray_icon is not None:
+            if self.startup_error is not None:
+                self.tray_icon.notify("Error", f"Failed to start: {str(self.startup_error)}")
+            else:
+                self.tray_icon.notify("Starting", "Still loading, try again in a moment")
+        return False
+        
+    def on_max_duration(self):
+        """Auto-submit the recording once the maximum duration is reached."""
+        self._submit_from_audio_thread()
+        
+    def on_endpoint(self):
+        """Auto-submit the recording once the speaker has paused, even if the key is still held."""
+        self._submit_from_audio_thread()
+        
+    def _submit_from_audio_thread(self):
+        """Stop and submit the recording on another thread."""
+        # Called from the audio thread, which must not stop its own stream
+        thread = threading.Thread(target=self.stop_and_paste)
+        thread.daemon = True
+        thread.start()
+        
+    def stop_and_paste(self):
+        """
+        Stop recording when hotkey is released (or a pause ends it) and queue the dictation.
+        
+        This runs on the keyboard hook thread, so it only stops the stream and
+        enqueues a job; encoding, transcription and pasting happen on workers.
+        """
+        # The hotkey release and an auto-submit can race; only one of them stops
+        with self.state_lock:
+            if not self.is_recording:
+                return
+            self.is_recording = False
+            session = self.streaming_session
+            self.streaming_session = None
+            language = self.recording_language
+            trace = self.trace
+            
+        trace.since('recording', 'stream_started')
+        trace.mark('released')
+        try:
+            # Stop recording and keep the audio in memory (only the tail when streaming)
+            with trace.span('stop'):
+                audio = self.voice_recorder.stop_recording_audio()
+        except Exception as e:
+            self.tray_icon.notify("Error", f"Failed to stop recording: {str(e)}")
+            audio = None
+        self.tray_icon.update_icon(recording=False)
+        
+        if audio is None and not (session and session.pending_count()):
+            self.tray_icon.notify("Warning", "No audio recorded")
+            return
+            
+        # Read the settings now, so the job uses those in effect when it was spoken
+        trim = self.settings_manager.get_setting('recording', 'trim_silence')
+        self.dictation_queue.submit(self.transcribe_dictation, audio, session, language, trim, trace)
+        
+    def transcribe_dictation(self, audio, session, language, trim, trace):
+        """
+        Trim, encode and transcribe one dictation (runs on a worker thread).
+        
+        Returns:
+            tuple: The text (None if there was no speech) and the dictation's trace
+        """
+        # Lower layers add their encode and network timings to the active trace
+        with latency.activate(trace), trace.span('transcribe'):
+            text = self._transcribe(audio, session, language, trim)
+        return text, trace
+        
+    def _transcribe(self, audio, session, language, trim):
+        """Transcribe the streamed segments and tail, or the whole recording."""
+        if session is not None and session.pending_count():
+            # Earlier segments are already in flight; only the tail is left to upload
+            self.tray_icon.notify("Processing", "Transcribing your speech...")
+            return session.finish(audio)
+            
+        # Trim dead air; a capture with no speech skips the network call
+        if trim:
+            from speech_to_text.vad import trim_silence
+
+            with latency.span('trim'):
+                audio = trim_silence(audio, self.voice_recorder.sample_rate)
+            if audio is None:
+                return None
+                
+        # Update UI
+        self.tray_icon.notify("Processing", "Transcribing your speech...")
+        
+        # Transcribe the audio
+        return self.transcription_service.transcribe_audio(
+            audio,
+            self.voice_recorder.sample_rate,
+            language=language
+        )
+        
+    def paste_result(self, result):
+        """Paste a finished dictation (called in the order dictations were spoken)."""
+        text, trace = result
+        if text:
+            import pyperclip
+            
+            # A pause can end the dictation while the hotkey is still held; the text
+            # is ready by then, and goes in as soon as the keys come up
+            if not self.hotkey_released.wait(timeout=60):
+                print("Hotkey still held after 60 seconds, pasting anyway")
+                
+            # Copy to clipboard and paste
+            with trace.span('clipboard'):
+                pyperclip.copy(text)
+            with trace.span('paste'):
+                keyboard.press_and_release('ctrl+v')
+            self.tray_icon.notify("Success", "Text has been pasted")
+        else:
+            self.tray_icon.notify("Warning", "No speech detected")
+            
+        trace.since('total', 'released')
+        self.latency_stats.record(trace)
+        
+    def show_latency(self):
+        """Show per-stage latency percentiles from the tray menu."""
+        summary = self.latency_stats.summary()
+        print(summary)
+        self.tray_icon.notify("Latency", summary)
+        
+    def report_error(self, error):
+        """Report a dictation that failed to transcribe."""
+        self.tray_icon.notify("Error", f"Transcription failed: {str(error)}")
+        
+    def show_settings(self):
+        """Show the settings window."""
+        import tkinter as tk
+        
+        # The microphone list needs the recorder
+        if not self.check_ready():
+            return
+            
+        if self.settings_window is not None:
+            # If settings window exists, just bring it to front
+            self.settings_window.lift()
+            self.settings_window.focus_force()
+            return
+            
+        # Create a settings window
+        self.settings_window = tk.Toplevel()
+        self.settings_window.title("Speech to Text Settings")
+        self.settings_window.geometry("500x400")
+        self.settings_window.minsize(400, 300)
+        self.settings_window.protocol("WM_DELETE_WINDOW", self.close_settings)
+        
+        # Add settings UI components
+        self.create_settings_ui()
+        
+    def create_settings_ui(self):
+        """Create the settings UI."""
+        import tkinter as tk
+        import tkinter.ttk as ttk
+        
+        # Create main frame with padding
+        main_frame = ttk.Frame(self.settings_window, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Header
+        header_label = ttk.Label(
+            main_frame, 
+            text="Speech to Text Settings",
+            font=("Arial", 16, "bold")
+        )
+        header_label.pack(fill=tk.X, pady=(0, 20))
+        
+        # Create tabs
+        tab_control = ttk.Notebook(main_frame)
+        
+        # General tab
+        general_tab = ttk.Frame(tab_control)
+        tab_control.add(general_tab, text="General")
+        
+        # Microphone selection
+        mic_frame = ttk.LabelFrame(general_tab, text="Microphone Selection", padding=10)
+        mic_frame.pack(fill=tk.X, pady=10)
+        
+        # Get available microphones
+        microphones = self.voice_recorder.get_available_devices()
+        mic_names = [device['name'] for device in microphones]
+        
+        # Current microphone
+        current_mic_name = self.settings_manager.get_setting('microphone', 'device_name')
+        mic_var = tk.StringVar(value=current_mic_name)
+        
+        # Microphone dropdown
+        ttk.Label(mic_frame, text="Select Microphone:").pack(anchor=tk.W, pady=(0, 5))
+        mic_dropdown = ttk.Combobox(mic_frame, textvariable=mic_var, values=mic_names, width=40)
+        mic_dropdown.pack(fill=tk.X)
+        
+        # Language selection
+        lang_frame = ttk.LabelFrame(general_tab, text="Language Selection", padding=10)
+        lang_frame.pack(fill=tk.X, pady=10)
+        
+        # Get available languages
+        languages = self.settings_manager.get_available_languages()
+        lang_names = [f"{code} - {name}" for code, name in languages]
+        
+        # Current language
+        current_lang = self.settings_manager.get_setting('language')
+        lang_var = tk.StringVar(value=f"{current_lang} - {dict(languages).get(current_lang, 'Unknown')}")
+        
+        # Language dropdown
+        ttk.Label(lang_frame, text="Select Language:").pack(anchor=tk.W, pady=(0, 5))
+        lang_dropdown = ttk.Combobox(lang_frame, textvariable=lang_var, values=lang_names, width=40)
+        lang_dropdown.pack(fill=tk.X)
+        
+        # Hotkeys tab
+        hotkeys_tab = ttk.Frame(tab_control)
+        tab_control.add(hotkeys_tab, text="Hotkeys")
+        
+        # Hotkey configuration
+        hotkey_frame = ttk.LabelFrame(hotkeys_tab, text="Activation Hotkey", padding=10)
+        hotkey_frame.pack(fill=tk.X, pady=10)
+        
+        # Current hotkey
+        current_hotkey = self.hotkey_manager.get_hotkey('activate')
+        hotkey_var = tk.StringVar(value=current_hotkey)
+        
+        # Hotkey input field
+        ttk.Label(hotkey_frame, text="Press combination:").pack(anchor=tk.W, pady=(0, 5))
+        hotkey_entry = ttk.Entry(hotkey_frame, textvariable=hotkey_var)
+        hotkey_entry.pack(fill=tk.X, pady=5)
+        
+        # Record button
+        record_button = ttk.Button(
+            hotkey_frame,
+            text="Record New Hotkey",
+            command=lambda: self.record_hotkey(hotkey_var)
+        )
+        record_button.pack(pady=5)
+        
+        # Output tab
+        output_tab = ttk.Frame(tab_control)
+        tab_control.add(output_tab, text="Output")
+        
+        # Output options
+        output_frame = ttk.LabelFrame(output_tab, text="Output Options", padding=10)
+        output_frame.pack(fill=tk.X, pady=10)
+        
+        # Output checkboxes
+        paste_var = tk.BooleanVar(value=self.settings_manager.get_setting('output', 'paste_directly'))
+        copy_var = tk.BooleanVar(value=self.settings_manager.get_setting('output', 'copy_to_clipboard'))
+        
+        ttk.Checkbutton(
+            output_frame,
+            text="Paste text directly at cursor position",
+            variable=paste_var
+        ).pack(anchor=tk.W, pady=5)
+        
+        ttk.Checkbutton(
+            output_frame,
+            text="Copy text to clipboard",
+            variable=copy_var
+        ).pack(anchor=tk.W, pady=5)
+        
+        # Recording options frame
+        recording_frame = ttk.LabelFrame(output_tab, text="Recording Options", padding=10)
+        recording_frame.pack(fill=tk.X, pady=10)
+        
+        # Max duration setting
+        ttk.Label(recording_frame, text="Maximum recording duration (seconds):").pack(anchor=tk.W, pady=(0, 5))
+        duration_var = tk.IntVar(value=self.settings_manager.get_setting('recording', 'max_duration'))
+        duration_spinbox = ttk.Spinbox(
+            recording_frame,
+            from_=5,
+            to=120,
+            textvariable=duration_var,
+            width=5
+        )
+        duration_spinbox.pack(anchor=tk.W)
+        
+        # Streaming option
+        streaming_var = tk.BooleanVar(value=self.settings_manager.get_setting('recording', 'streaming'))
+        ttk.Checkbutton(
+            recording_frame,
+            text="Transcribe while recording (send pauses as they happen)",
+            variable=streaming_var
+        ).pack(anchor=tk.W, pady=(10, 0))
+        
+        # Endpointing options
+        toggle_var = tk.BooleanVar(value=self.settings_manager.get_setting('recording', 'mode') == 'toggle')
+        ttk.Checkbutton(
+            recording_frame,
+            text="Press hotkey once to start, stop when I pause (toggle mode)",
+            variable=toggle_var
+        ).pack(anchor=tk.W, pady=(5, 0))
+        
+        endpoint_var = tk.BooleanVar(value=self.settings_manager.get_setting('recording', 'auto_endpoint'))
+        ttk.Checkbutton(
+            recording_frame,
+            text="Transcribe as soon as I pause, even if the hotkey is still held",
+            variable=endpoint_var
+        ).pack(anchor=tk.W, pady=(5, 0))
+        
+        # Add tabs to window
+        tab_control.pack(expand=1, fill=tk.BOTH)
+        
+        # Button frame
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(20, 0))
+        
+        # Save button
+        save_button = ttk.Button(
+            button_frame,
+            text="Save",
+            command=lambda: self.save_settings(
+                mic_dropdown, 
+                microphones, 
+                mic_var.get(),
+                lang_var.get(),
+                hotkey_var.get(),
+                paste_var.get(),
+                copy_var.get(),
+                duration_var.get(),
+                streaming_var.get(),
+                toggle_var.get(),
+                endpoint_var.get()
+            )
+        )
+        save_button.pack(side=tk.RIGHT, padx=5)
+        
+        # Cancel button
+        cancel_button = ttk.Button(
+            button_frame,
+            text="Cancel",
+            command=self.close_settings
+        )
+        cancel_button.pack(side=tk.RIGHT, padx=5)
+        
+    def record_hotkey(self, hotkey_var):
+        """Record a new hotkey."""
+        import tkinter as tk
+        
+        # Create a small window to capture the hotkey
+        record_window = tk.Toplevel(self.settings_window)
+        record_window.title("Record Hotkey")
+        record_window.geometry("300x150")
+        record_window.resizable(False, False)
+        record_window.transient(self.settings_window)
+        record_window.grab_set()
+        
+        # Create a label
+        label = tk.Label(
+            record_window,
+            text="Press the keys you want to use as hotkey...",
+            wraplength=250,
+            pady=20
+        )
+        label.pack()
+        
+        # Variable to store the pressed keys
+        keys_pressed = []
+        
+        def on_key(event):
+            """Handle key press events."""
+            key = event.keysym.lower()
+            
+            # Ignore duplicate keys
+            if key not in keys_pressed and key not in ('shift', 'control', 'alt'):
+                keys_pressed.append(key)
+                
+            # Construct the hotkey string
+            modifiers = []
+            if 'Control' in event.state:
+                modifiers.append('ctrl')
+            if 'Shift' in event.state:
+                modifiers.append('shift')
+            if 'Alt' in event.state:
+                modifiers.append('alt')
+                
+            if keys_pressed:
+                hotkey_str = '+'.join(modifiers + [keys_pressed[-1]])
+                hotkey_var.set(hotkey_str)
+                
+                # Close the window after a short delay
+                record_window.after(500, record_window.destroy)
+                
+        # Bind key press events
+        record_window.bind('<Key>', on_key)
+        
+        # Button to cancel
+        cancel_button = tk.Button(
+            record_window,
+            text="Cancel",
+            command=record_window.destroy
+        )
+        cancel_button.pack(pady=10)
+        
+    def save_settings(self, mic_dropdown, microphones, mic_name, lang_str, hotkey, paste_directly, copy_to_clipboard, max_duration, streaming, toggle_mode, auto_endpoint):
+        """Save the settings."""
+        try:
+            # All changes below are written together, in one atomic save
+            with self.settings_manager.batch():
+                # Save microphone settings
+                mic_index = mic_dropdown.current()
+                if mic_index >= 0:
+                    device_id = microphones[mic_index]['index']
+                    self.settings_manager.set_setting(device_id, 'microphone', 'device_id')
+                    self.settings_manager.set_setting(mic_name, 'microphone', 'device_name')
+            
+                # Save language setting
+                lang_code = lang_str.split(' - ')[0]
+                self.settings_manager.set_setting(lang_code, 'language')
+            
+                # Save hotkey setting
+                current_hotkey = self.hotkey_manager.get_hotkey('activate')
+                if hotkey != current_hotkey:
+                    # Unregister old hotkey and register new one
+                    self.hotkey_manager.unregister_hotkey('activate')
+                    self.hotkey_manager.register_hotkey(
+                        'activate',
+                        hotkey,
+                        self.on_hotkey_press,
+                        self.on_hotkey_release
+                    )
+                    self.hotkey_manager.update_hotkey('activate', hotkey)
+            
+                # Save output settings
+                self.settings_manager.set_setting(paste_directly, 'output', 'paste_directly')
+                self.settings_manager.set_setting(copy_to_clipboard, 'output', 'copy_to_clipboard')
+            
+                # Save recording settings
+                self.settings_manager.set_setting(max_duration, 'recording', 'max_duration')
+                self.settings_manager.set_setting(streaming, 'recording', 'streaming')
+                self.settings_manager.set_setting('toggle' if toggle_mode else 'hold', 'recording', 'mode')
+                self.settings_manager.set_setting(auto_endpoint, 'recording', 'auto_endpoint')
+            
+            # Close the settings window
+            self.close_settings()
+            
+            # Notify the user
+            self.tray_icon.notify("Settings Saved", "Your settings have been updated")
+            
+        except Exception as e:
+            from tkinter import messagebox
+            messagebox.showerror("Error", f"Failed to save settings: {str(e)}")
+    
+    def close_settings(self):
+        """Close the settings window."""
+        if self.settings_window:
+            self.settings_window.destroy()
+            self.settings_window = None
+    
+    def exit_app(self):
+        """Exit the application."""
+        # Unregister all hotkeys
+        self.hotkey_manager.unregister_all()
+        
+        # Write any settings change still waiting for its debounced save
+        self.settings_manager.store.flush()
+        
+        # Stop any recording
+        if self.is_recording:
+            self.voice_recorder.stop_recording_audio()
+        if self.ready.is_set():
+            self.voice_recorder.close_stream()
+            self.dictation_queue.shutdown()
+            self.streaming_transcriber.shutdown()
+            
+        # Exit the application
+        import sys
+        sys.exit(0)
+
+def main():
+    """Launch the Speech to Text application."""
+    app = SpeechToTextTrayApp()
+    app.run()
+    
+    # Keep the main thread running
+    while True:
+        time.sleep(1)
+
+if __name__ == "__main__":
+    main()
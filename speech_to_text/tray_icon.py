@@ -1,39 +1,90 @@
 """
 System tray integration for the Speech to Text application.
 """
+import math
+import threading
 import pystray
 from PIL import Image, ImageDraw
-import tkinter as tk
-import os
-import sys
+
+ICON_SIZE = 64
+STANDBY_COLOR = (0, 120, 212)
+RECORDING_COLOR = (212, 0, 0)
+
+# Waveform animation: frames for each quantized level, each with a few phases of motion
+WAVE_LEVELS = 8
+WAVE_PHASES = 4
+WAVE_BARS = 5
+ANIMATION_FPS = 12
+
+def render_microphone_icon(color):
+    """Draw the microphone icon on a circle of the given color."""
+    image = Image.new('RGBA', (ICON_SIZE, ICON_SIZE), (0, 0, 0, 0))
+    dc = ImageDraw.Draw(image)
+    dc.ellipse((4, 4, ICON_SIZE-4, ICON_SIZE-4), fill=color)
+    dc.rectangle((24, 16, 40, 40), fill="white")
+    dc.ellipse((22, 38, 42, 48), fill="white")
+    return image
+    
+def render_wave_icon(level, phase):
+    """
+    Draw a sound-wave frame on the recording circle.
+    
+    Args:
+        level (int): Loudness step, 0 (silent) to WAVE_LEVELS - 1
+        phase (int): Animation step, 0 to WAVE_PHASES - 1
+    """
+    image = Image.new('RGBA', (ICON_SIZE, ICON_SIZE), (0, 0, 0, 0))
+    dc = ImageDraw.Draw(image)
+    dc.ellipse((4, 4, ICON_SIZE-4, ICON_SIZE-4), fill=RECORDING_COLOR)
+    
+    center = ICON_SIZE / 2
+    bar_width = 5
+    gap = 3
+    left = center - (WAVE_BARS * bar_width + (WAVE_BARS - 1) * gap) / 2
+    amplitude = level / (WAVE_LEVELS - 1)
+    for i in range(WAVE_BARS):
+        # Middle bars are tallest; the phase ripples the heights so the wave moves
+        envelope = 1.0 - abs(i - (WAVE_BARS - 1) / 2) / WAVE_BARS
+        ripple = 0.75 + 0.25 * math.sin(2 * math.pi * (phase / WAVE_PHASES + i / WAVE_BARS))
+        half_height = 3 + 20 * amplitude * envelope * ripple
+        x0 = left + i * (bar_width + gap)
+        dc.rounded_rectangle(
+            (x0, center - half_height, x0 + bar_width, center + half_height),
+            radius=2,
+            fill="white"
+        )
+    return image
 
 class SystemTrayIcon:
     """System tray icon for the Speech to Text application."""
     
-    def __init__(self, show_window_callback, exit_callback):
+    def __init__(self, show_window_callback, exit_callback, latency_callback=None):
         """Initialize the system tray icon."""
         self.show_window_callback = show_window_callback
         self.exit_callback = exit_callback
+        self.latency_callback = latency_callback
         self.icon = None
+        self.current = None
+        self.animation = None
+        self.animation_stop = threading.Event()
         
-    def create_icon(self):
-        """Create a simple icon for the system tray."""
-        # Create a simple icon (a colored circle)
-        icon_size = 64
-        image = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
-        dc = ImageDraw.Draw(image)
-        
-        # Draw a blue circle with a microphone-like shape
-        dc.ellipse((4, 4, icon_size-4, icon_size-4), fill=(0, 120, 212))
-        dc.rectangle((24, 16, 40, 40), fill="white")
-        dc.ellipse((22, 38, 42, 48), fill="white")
+        # Every image the icon can show is drawn once, here, and only swapped in later
+        self.standby_image = render_microphone_icon(STANDBY_COLOR)
+        self.recording_image = render_microphone_icon(RECORDING_COLOR)
+        self.wave_frames = [
+            [render_wave_icon(level, phase) for phase in range(WAVE_PHASES)]
+            for level in range(WAVE_LEVELS)
+        ]
         
-        return image
+    def create_icon(self):
+        """Return the standby icon for the system tray."""
+        return self.standby_image
         
     def create_menu(self):
         """Create the system tray menu."""
         return pystray.Menu(
             pystray.MenuItem('Show', self.show_window),
+            pystray.MenuItem('Latency', self.show_latency, visible=self.latency_callback is not None),
             pystray.MenuItem('Exit', self.exit_app)
         )
         
@@ -42,6 +93,11 @@ class SystemTrayIcon:
         if self.show_window_callback:
             self.show_window_callback()
             
+    def show_latency(self, icon, item):
+        """Show latency statistics."""
+        if self.latency_callback:
+            self.latency_callback()
+            
     def exit_app(self, icon, item):
         """Exit the application."""
         icon.stop()
@@ -51,6 +107,7 @@ class SystemTrayIcon:
     def run(self):
         """Run the system tray icon."""
         image = self.create_icon()
+        self.current = image
         menu = self.create_menu()
         
         self.icon = pystray.Icon(
@@ -65,27 +122,50 @@ class SystemTrayIcon:
         
     def stop(self):
         """Stop the system tray icon."""
+        self.stop_animation()
         if self.icon:
             self.icon.stop()
             
-    def update_icon(self, recording=False):
-        """Update the icon to indicate recording status."""
-        if self.icon:
-            icon_size = 64
-            image = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
-            dc = ImageDraw.Draw(image)
+    def update_icon(self, recording=False, levels=None):
+        """
+        Update the icon to indicate recording status.
+        
+        Args:
+            recording (bool): Whether recording is in progress
+            levels (LevelHistory, optional): Live audio levels; while recording, the icon
+                becomes a sound wave that follows them
+        """
+        self.stop_animation()
+        if recording and levels is not None:
+            self.animation_stop.clear()
+            self.animation = threading.Thread(target=self._animate, args=(levels,), name="tray-animation")
+            self.animation.daemon = True
+            self.animation.start()
+        else:
+            self._show(self.recording_image if recording else self.standby_image)
+            
+    def stop_animation(self):
+        """Stop the sound-wave animation, if it is running."""
+        if self.animation is not None:
+            self.animation_stop.set()
+            if self.animation is not threading.current_thread():
+                self.animation.join()
+            self.animation = None
             
-            # Change color based on recording status
-            if recording:
-                # Red circle for recording
-                dc.ellipse((4, 4, icon_size-4, icon_size-4), fill=(212, 0, 0))
-            else:
-                # Blue circle for standby
-                dc.ellipse((4, 4, icon_size-4, icon_size-4), fill=(0, 120, 212))
-                
-            dc.rectangle((24, 16, 40, 40), fill="white")
-            dc.ellipse((22, 38, 42, 48), fill="white")
+    def _animate(self, levels):
+        """Show the wave frame for the current level, at most ANIMATION_FPS times a second."""
+        phase = 0
+        while not self.animation_stop.wait(1.0 / ANIMATION_FPS):
+            rms, _ = levels.latest()
+            # Speech RMS is mostly well below full scale; a square root spreads it over the levels
+            level = min(WAVE_LEVELS - 1, int(math.sqrt(rms) * 2 * WAVE_LEVELS))
+            phase = (phase + 1) % WAVE_PHASES if level else 0
+            self._show(self.wave_frames[level][phase])
             
+    def _show(self, image):
+        """Swap in a pre-rendered image; unchanged frames are not sent to the OS again."""
+        if self.icon and image is not self.current:
+            self.current = image
             self.icon.icon = image
             
     def notify(self, title, message):
@@ -0,0 +1,87 @@
+"""
+Voice activity detection for the Speech to Text application.
+Vectorized energy / zero-crossing analysis used to trim silence before upload.
+"""
+import numpy as np
+
+def to_mono_float(audio_data):
+    """Return the samples as a 1-D float32 array on a -1..1 scale."""
+    if audio_data.ndim > 1:
+        audio_data = audio_data.mean(axis=1, dtype=np.float32)
+    if audio_data.dtype == np.int16:
+        return audio_data.astype(np.float32) / 32768
+    return audio_data.astype(np.float32, copy=False)
+
+def frame_features(audio_data, sample_rate, frame_ms=20):
+    """
+    Compute per-frame RMS energy and zero-crossing rate.
+
+    Args:
+        audio_data (numpy.ndarray): Recorded samples
+        sample_rate (int): Sample rate of the recording
+        frame_ms (int): Frame length in milliseconds
+
+    Returns:
+        tuple: (rms, zcr, frame_length) where rms and zcr have one value per full frame
+    """
+    samples = to_mono_float(audio_data)
+    frame_length = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return np.zeros(0, np.float32), np.zeros(0, np.float32), frame_length
+
+    frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_length)
+    return rms, zcr, frame_length
+
+def speech_frames(audio_data, sample_rate, energy_threshold=0.01, noise_factor=3.0,
+                  zcr_threshold=0.25, frame_ms=20):
+    """
+    Classify each frame as speech or silence.
+
+    A frame is speech when its energy clears both the absolute threshold and a
+    multiple of the recording's noise floor. Quieter frames with a high
+    zero-crossing rate (fricatives such as "s" and "f") also count, at half
+    the energy threshold.
+
+    Returns:
+        tuple: (mask, frame_length) where mask is a boolean array with one entry per frame
+    """
+    rms, zcr, frame_length = frame_features(audio_data, sample_rate, frame_ms)
+    if len(rms) == 0:
+        return np.zeros(0, bool), frame_length
+
+    noise_floor = np.percentile(rms, 10)
+    threshold = max(energy_threshold, noise_floor * noise_factor)
+    mask = (rms >= threshold) | ((rms >= threshold / 2) & (zcr >= zcr_threshold))
+    return mask, frame_length
+
+def trim_silence(audio_data, sample_rate, padding=0.2, min_speech=0.1, **kwargs):
+    """
+    Trim leading and trailing silence.
+
+    Args:
+        audio_data (numpy.ndarray): Recorded samples
+        sample_rate (int): Sample rate of the recording
+        padding (float): Seconds of audio kept on either side of the detected speech
+        min_speech (float): Minimum seconds of speech for the clip to count as speech
+        **kwargs: Thresholds passed on to speech_frames
+
+    Returns:
+        numpy.ndarray: A view of the speech region, or None if there is no speech
+    """
+    if audio_data is None or len(audio_data) == 0:
+        return None
+
+    mask, frame_length = speech_frames(audio_data, sample_rate, **kwargs)
+    speech_count = np.count_nonzero(mask)
+    if speech_count * frame_length < min_speech * sample_rate:
+        return None
+
+    voiced = np.flatnonzero(mask)
+    pad = int(padding * sample_rate)
+    start = max(0, voiced[0] * frame_length - pad)
+    end = min(len(audio_data), (voiced[-1] + 1) * frame_length + pad)
+    return audio_data[start:end]
@@ -7,26 +7,83 @@ import numpy as np
 import scipy.io.wavfile as wav
 import os
 import tempfile
-from threading import Thread
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
+import threading
+
+from speech_to_text.audio_buffer import AudioBuffer
+from speech_to_text.level_meter import LevelHistory, LevelMeter
+from speech_to_text.resampler import StreamingResampler
 
 class VoiceRecorder:
     """Records audio from a microphone and provides visualization."""
     
-    def __init__(self, sample_rate=16000, channels=1):
-        """Initialize the recorder with given parameters."""
+    def __init__(self, sample_rate=16000, channels=1, dtype='float32', silence_threshold=0.01,
+                 segment_silence=0.6, min_segment_duration=2.0, keep_warm=False, preroll=0.3,
+                 idle_timeout=300.0, native_capture=True, min_speech_duration=0.3):
+        """
+        Initialize the recorder with given parameters.
+        
+        Args:
+            sample_rate (int): Rate of the recorded audio handed to callers
+            channels (int): Channels of the recorded audio handed to callers
+            keep_warm (bool): Keep the input stream open between recordings, so starting
+                one costs no device work and includes `preroll` seconds of earlier audio
+            preroll (float): Seconds of audio from before start_recording to include
+                when the stream is kept warm
+            idle_timeout (float): Close a warm stream after this many idle seconds;
+                the next recording reopens it. None keeps it open indefinitely.
+            native_capture (bool): Open mono recordings at the device's own rate and
+                channel count, converting to sample_rate mono while recording
+            min_speech_duration (float): Seconds above the silence threshold needed before
+                trailing silence can end a recording, so a click or cough doesn't
+        """
         self.sample_rate = sample_rate
         self.channels = channels
+        self.dtype = dtype
         self.recording = False
-        self.audio_data = []
+        self.buffer = None
+        self.on_limit = None
+        
+        # Guards start/stop, which the hotkey, audio and worker threads may race on
+        self.lock = threading.Lock()
+        
+        # The stream, kept open between recordings when warm
+        self.stream = None
+        self.stream_device = None
+        self.keep_warm = keep_warm
+        self.idle_timeout = idle_timeout
+        self.idle_timer = None
+        self.native_capture = native_capture and channels == 1
+        self.converter = None
+        
+        # Handed to the audio callback: `pending_buffer` is picked up on the next
+        # block (after the pre-roll), then written as `active_buffer`
+        self.pending_buffer = None
+        self.active_buffer = None
+        
+        # Ring of the most recent idle audio, written only by the audio callback
+        self.preroll = np.zeros((int(preroll * sample_rate) if keep_warm else 0, channels), dtype=dtype)
+        self.preroll_frames = 0
+        
+        # Levels are computed on a -1..1 scale regardless of the sample type
+        self._level_scale = 1.0 / 32768 if dtype == 'int16' else 1.0
+        
+        # Utterance segmentation (only active when an on_segment callback is given)
+        self.silence_threshold = silence_threshold
+        self.segment_silence = segment_silence
+        self.min_segment_duration = min_segment_duration
+        self.on_segment = None
+        self._reset_segment_state()
+        
+        # Endpointing (only active when an on_endpoint callback is given)
+        self.min_speech_duration = min_speech_duration
+        self.endpoint_silence = None
+        self.on_endpoint = None
+        self._reset_endpoint_state()
+        
         self.temp_dir = tempfile.gettempdir()
-        self.figure = None
-        self.canvas = None
-        self.line = None
-        self.ax = None
+        
+        # Published by the audio callback, drawn by a LevelMeter on the UI thread
+        self.levels = LevelHistory()
     
     def get_available_devices(self):
         """Return a list of available input devices."""
@@ -34,57 +91,332 @@ class VoiceRecorder:
         input_devices = [device for device in devices if device['max_input_channels'] > 0]
         return input_devices
     
-    def start_recording(self, device_id=None):
-        """Start recording audio from the microphone."""
-        self.recording = True
-        self.audio_data = []
-        
-        def callback(indata, frames, time, status):
-            """Callback function for the InputStream."""
-            if status:
-                print(f"Status: {status}")
-            self.audio_data.append(indata.copy())
-            
-            # Update visualization if available
-            if self.line is not None and len(self.audio_data) > 0:
+    def open_stream(self, device_id=None):
+        """
+        Open and start the input stream, if it isn't already open on this device.
+        
+        With keep_warm, call this ahead of the first recording so that one
+        starts instantly too.
+        """
+        with self.lock:
+            self._open_stream(device_id)
+            if not self.recording:
+                self._schedule_idle_close()
+                
+    def close_stream(self):
+        """Stop and close the input stream, e.g. on exit or after idling."""
+        with self.lock:
+            self._cancel_idle_close()
+            self._close_stream()
+            
+    def start_recording(self, device_id=None, on_segment=None, max_duration=None, on_limit=None,
+                        on_endpoint=None, endpoint_silence=0.8):
+        """
+        Start recording audio from the microphone.
+        
+        Args:
+            device_id (int, optional): Input device index, or None for the default device
+            on_segment (callable, optional): Called with a view of the recorded samples
+                each time an utterance ends at a pause. Runs on the audio thread,
+                so it must only hand the samples off and return.
+            max_duration (float, optional): Maximum recording length in seconds. The
+                buffer is preallocated at this size and audio past it is dropped.
+            on_limit (callable, optional): Called once, from the audio thread, when
+                max_duration is reached. Must not stop the recorder directly.
+            on_endpoint (callable, optional): Called once, from the audio thread, when
+                speech is followed by endpoint_silence seconds of silence. Must not stop
+                the recorder directly.
+            endpoint_silence (float): Trailing silence, in seconds, that ends the speech
+        """
+        with self.lock:
+            if self.recording:
+                return False
+            self._cancel_idle_close()
+            
+            # One allocation per recording; earlier recordings keep their own buffer,
+            # so views handed out for them stay valid
+            preroll_frames = len(self.preroll)
+            max_frames = int(max_duration * self.sample_rate) + preroll_frames if max_duration else None
+            self.buffer = AudioBuffer(
+                channels=self.channels,
+                dtype=self.dtype,
+                max_frames=max_frames,
+                initial_frames=self.sample_rate * 30
+            )
+            self.recording = True
+            self.on_segment = on_segment
+            self.on_limit = on_limit
+            self.on_endpoint = on_endpoint
+            self.endpoint_silence = endpoint_silence
+            self._reset_segment_state()
+            self._reset_endpoint_state()
+            
+            # With a warm stream this is the only work: the callback picks the buffer up
+            self.pending_buffer = self.buffer
+            try:
+                self._open_stream(device_id)
+            except Exception:
+                # Leave the recorder startable again after a device error
+                self.pending_buffer = None
+                self.recording = False
+                raise
+            return True
+            
+    def _open_stream(self, device_id):
+        """Create and start the InputStream, replacing one open on another device (lock held)."""
+        if self.stream is not None:
+            if self.stream_device == device_id:
+                return
+            self._close_stream()
+            
+        self.preroll_frames = 0
+        self.converter = None
+        if self.native_capture:
+            rate, channels = self._native_format(device_id)
+            if rate != self.sample_rate or channels != self.channels:
                 try:
-                    # Calculate the audio level for visualization
-                    audio_segment = self.audio_data[-1].flatten()
-                    level = np.abs(audio_segment).mean() * 100
-                    data = np.random.rand(100) * level
-                    self.line.set_ydata(data)
-                    self.canvas.draw_idle()
+                    self.converter = StreamingResampler(rate, self.sample_rate, channels, self.dtype)
+                    self._start_stream(device_id, rate, channels, 'float32')
+                    return
                 except Exception as e:
-                    print(f"Visualization error: {e}")
+                    # Let PortAudio convert instead, as it did before native capture
+                    print(f"Could not open the device at {rate} Hz, {channels} channel(s): {e}")
+                    self.converter = None
+                    
+        self._start_stream(device_id, self.sample_rate, self.channels, self.dtype)
         
-        # Create and start the InputStream
-        self.stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=self.channels,
-            callback=callback,
+    def _start_stream(self, device_id, rate, channels, dtype):
+        """Create and start an InputStream in the given format (lock held)."""
+        stream = sd.InputStream(
+            samplerate=rate,
+            channels=channels,
+            dtype=dtype,
+            callback=self._callback,
             device=device_id
         )
-        self.stream.start()
-        return True
-    
-    def stop_recording(self):
-        """Stop recording and save the audio to a WAV file."""
-        if not self.recording:
-            return None
+        try:
+            stream.start()
+        except Exception:
+            stream.close()
+            raise
+        self.stream = stream
+        self.stream_device = device_id
+        
+    def _native_format(self, device_id):
+        """Return the device's default sample rate and channel count (at most stereo)."""
+        try:
+            info = sd.query_devices(device_id, 'input')
+            return int(info['default_samplerate']), max(1, min(int(info['max_input_channels']), 2))
+        except Exception as e:
+            print(f"Could not query the input device: {e}")
+            return self.sample_rate, self.channels
             
-        self.recording = False
-        if hasattr(self, 'stream'):
+    def _close_stream(self):
+        """Stop and close the InputStream, if open (lock held)."""
+        if self.stream is None:
+            return
+        try:
             self.stream.stop()
             self.stream.close()
+        except Exception as e:
+            print(f"Error closing input stream: {e}")
+        self.stream = None
+        self.stream_device = None
         
-        if not self.audio_data:
-            return None
+    def _schedule_idle_close(self):
+        """Close a warm stream once it has been idle for idle_timeout seconds (lock held)."""
+        self._cancel_idle_close()
+        if self.stream is not None and self.idle_timeout is not None:
+            self.idle_timer = threading.Timer(self.idle_timeout, self._close_if_idle)
+            self.idle_timer.daemon = True
+            self.idle_timer.start()
+            
+    def _cancel_idle_close(self):
+        """Cancel a pending idle close (lock held)."""
+        if self.idle_timer is not None:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+            
+    def _close_if_idle(self):
+        """Idle timer: close the stream unless a recording started meanwhile."""
+        with self.lock:
+            if not self.recording:
+                self.idle_timer = None
+                self._close_stream()
+                
+    def _callback(self, indata, frames, time, status):
+        """Callback function for the InputStream."""
+        if status:
+            print(f"Status: {status}")
             
-        # Convert the recorded data to a NumPy array
-        audio_data = np.concatenate(self.audio_data, axis=0)
+        # Native-rate capture: convert to the recorder's rate and mono as blocks arrive
+        converter = self.converter
+        if converter is not None:
+            indata = converter.process(indata)
+            frames = len(indata)
+            if not frames:
+                return
+                
+        buffer = self.active_buffer
+        if buffer is None:
+            buffer = self.pending_buffer
+            if buffer is None:
+                # Idle: keep only the last moments, for the next recording's pre-roll
+                self._write_preroll(indata)
+                return
+            # A recording just started: it begins with the audio from before the key press
+            self._drain_preroll(buffer)
+            self.pending_buffer = None
+            self.active_buffer = buffer
+            
+        if buffer.full:
+            return
+            
+        if not buffer.write(indata):
+            # Recording limit reached: hand off the capture for auto-submission
+            on_limit = self.on_limit
+            if on_limit is not None:
+                on_limit()
+            return
+            
+        # One RMS/peak pair per block; the UI polls these instead of being driven from here
+        rms = float(np.sqrt(np.mean(np.square(indata, dtype=np.float32)))) * self._level_scale
+        peak = float(np.abs(indata).max()) * self._level_scale
+        self.levels.publish(rms, peak)
+        
+        # Split the capture at pauses when streaming
+        on_segment = self.on_segment
+        if on_segment is not None:
+            self._track_segment(rms, frames, buffer, on_segment)
+            
+        # Finish the capture as soon as the speaker has stopped, without waiting for the key
+        on_endpoint = self.on_endpoint
+        if on_endpoint is not None and not self._endpointed:
+            self._track_endpoint(rms, frames, on_endpoint)
+            
+    def _write_preroll(self, indata):
+        """Copy a block into the pre-roll ring (audio thread)."""
+        size = len(self.preroll)
+        if size == 0:
+            return
+        block = indata[-size:]
+        start = self.preroll_frames % size
+        first = min(len(block), size - start)
+        self.preroll[start:start + first] = block[:first]
+        self.preroll[:len(block) - first] = block[first:]
+        self.preroll_frames += len(block)
+        
+    def _drain_preroll(self, buffer):
+        """Write the pre-roll ring, oldest first, to the start of a recording (audio thread)."""
+        size = len(self.preroll)
+        if size == 0 or self.preroll_frames == 0:
+            return
+        if self.preroll_frames < size:
+            buffer.write(self.preroll[:self.preroll_frames])
+        else:
+            start = self.preroll_frames % size
+            buffer.write(self.preroll[start:])
+            buffer.write(self.preroll[:start])
+        self.preroll_frames = 0
+    
+    def _reset_segment_state(self):
+        """Reset the utterance segmentation counters."""
+        self._segment_start = 0
+        self._segment_frames = 0
+        self._silent_frames = 0
+        self._heard_speech = False
+        
+    def _track_segment(self, level, frames, buffer, on_segment):
+        """Emit the current segment once speech is followed by a long enough pause."""
+        self._segment_frames += frames
+        
+        if level >= self.silence_threshold:
+            self._heard_speech = True
+            self._silent_frames = 0
+        else:
+            self._silent_frames += frames
+            
+        if (self._heard_speech
+                and self._silent_frames >= self.segment_silence * self.sample_rate
+                and self._segment_frames >= self.min_segment_duration * self.sample_rate):
+            start = self._segment_start
+            end = buffer.frames
+            self._reset_segment_state()
+            self._segment_start = end
+            on_segment(buffer.view(start, end))
+    
+    def _reset_endpoint_state(self):
+        """Reset the endpointing counters."""
+        self._speech_frames = 0
+        self._trailing_silent_frames = 0
+        self._endpointed = False
+        
+    def _track_endpoint(self, level, frames, on_endpoint):
+        """Call on_endpoint once enough speech is followed by endpoint_silence of silence."""
+        if level >= self.silence_threshold:
+            self._speech_frames += frames
+            self._trailing_silent_frames = 0
+        else:
+            self._trailing_silent_frames += frames
+            
+        if (self._speech_frames >= self.min_speech_duration * self.sample_rate
+                and self._trailing_silent_frames >= self.endpoint_silence * self.sample_rate):
+            self._endpointed = True
+            on_endpoint()
+    
+    def _stop_and_collect(self):
+        """Stop recording and return a view of the recorded (tail) audio, or None."""
+        with self.lock:
+            if not self.recording:
+                return None
+            
+            self.recording = False
+            self.pending_buffer = None
+            self.active_buffer = None
+            if self.keep_warm:
+                # The stream stays open, feeding the pre-roll, until it has been idle a while
+                self._schedule_idle_close()
+            else:
+                self._close_stream()
+            
+            self.on_segment = None
+            self.on_limit = None
+            self.on_endpoint = None
+            if self.buffer.frames <= self._segment_start:
+                return None
+            
+            # A view into the preallocated buffer, no concatenation needed
+            return self.buffer.view(self._segment_start)
+    
+    def stop_recording_audio(self):
+        """
+        Stop recording and return the raw samples.
+        
+        When segmentation is active, only the tail recorded after the last
+        emitted segment is returned.
+        
+        Returns:
+            numpy.ndarray: The recorded samples, or None if there is no audio
+        """
+        return self._stop_and_collect()
+    
+    def stop_recording(self):
+        """
+        Stop recording and save the audio to a WAV file.
+        
+        When segmentation is active, only the tail recorded after the last
+        emitted segment is written.
+        
+        Returns:
+            str: Path to the WAV file, or None if there is no audio to save
+        """
+        audio_data = self._stop_and_collect()
+        if audio_data is None:
+            return None
         
-        # Generate a temporary file path
-        temp_file = os.path.join(self.temp_dir, 'temp_audio.wav')
+        # Generate a unique temporary file path
+        fd, temp_file = tempfile.mkstemp(prefix='temp_audio_', suffix='.wav', dir=self.temp_dir)
+        os.close(fd)
         
         # Save the audio data to a WAV file
         wav.write(temp_file, self.sample_rate, audio_data)
@@ -92,28 +424,5 @@ class VoiceRecorder:
         return temp_file
     
     def create_visualization(self, parent_widget):
-        """Create a visualization widget for audio levels."""
-        if self.figure is None:
-            # Create figure and axis
-            self.figure = Figure(figsize=(4, 1.5), dpi=100)
-            self.ax = self.figure.add_subplot(111)
-            
-            # Initialize with zeros
-            data = np.zeros(100)
-            self.line, = self.ax.plot(np.arange(100), data)
-            
-            # Set axis limits and labels
-            self.ax.set_ylim(0, 1)
-            self.ax.set_xlim(0, 100)
-            self.ax.set_title('Audio Level')
-            self.ax.set_xticks([])
-            
-            # Create the canvas
-            self.canvas = FigureCanvasTkAgg(self.figure, master=parent_widget)
-            self.canvas.draw()
-            
-            # Get the tkinter widget
-            widget = self.canvas.get_tk_widget()
-            
-            return widget
-        return None
+        """Create a widget showing the live audio level."""
+        return LevelMeter(parent_widget, self.levels)
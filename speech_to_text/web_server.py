@@ -0,0 +1,387 @@
+"""
+Web service for the Speech to Text application.
+Serves the upload page in templates/ and transcribes uploaded files on a bounded worker pool.
+"""
+import argparse
+import json
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from speech_to_text.batch import AUDIO_EXTENSIONS, create_file_service
+from speech_to_text.chunking import ChunkedTranscriber
+from speech_to_text.transcription_jobs import FINAL_STATES, JobQueue, JobStore
+
+# The page and its assets live at the top of the source tree, next to run.py
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_DIR = os.path.join(PROJECT_DIR, 'templates')
+STATIC_DIR = os.path.join(PROJECT_DIR, 'static')
+
+# Seconds a client told to back off should wait before retrying
+RETRY_AFTER = 5
+
+# Longest a job status request waits for a change, and how often an idle event stream pings
+POLL_TIMEOUT = 30.0
+
+class TranscriptionWorkers:
+    """
+    A bounded pool of transcription workers with a cap on uploads in flight.
+
+    An upload holds a slot from before its body is read until its response is
+    ready, so a full server refuses new uploads without spooling them first.
+    """
+
+    def __init__(self, transcription_service, workers=2, max_in_flight=8, chunk_workers=2,
+                 upload_dir=None):
+        """
+        Initialize the pool.
+
+        Args:
+            transcription_service (TranscriptionService): Service shared by all workers
+            workers (int): Files transcribed at once
+            max_in_flight (int): Uploads accepted at once, running or waiting for a worker
+            chunk_workers (int): Chunks of one long file transcribed at once
+            upload_dir (str, optional): Where uploads are spooled; defaults to a new temp folder
+        """
+        self.chunker = ChunkedTranscriber(transcription_service, max_workers=chunk_workers)
+        self.workers = workers
+        self.max_in_flight = max(workers, max_in_flight)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web")
+        self.owns_upload_dir = upload_dir is None
+        self.upload_dir = upload_dir or tempfile.mkdtemp(prefix="speechtotext-uploads-")
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.closing = False
+
+    def acquire(self):
+        """Take a slot for an upload; returns False when the server is full or shutting down."""
+        with self.condition:
+            if self.closing or self.in_flight >= self.max_in_flight:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        """Give back a slot taken by acquire()."""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def submit(self, file_path, language=None):
+        """Queue a spooled upload for transcription and return its future."""
+        return self.executor.submit(self.chunker.transcribe_file, file_path, language=language)
+
+    def status(self):
+        """Return the pool's load as a JSON-serializable dict."""
+        with self.condition:
+            return {
+                'in_flight': self.in_flight,
+                'max_in_flight': self.max_in_flight,
+                'workers': self.workers,
+                'closing': self.closing
+            }
+
+    def close(self, timeout=None):
+        """
+        Stop accepting uploads and wait for the ones in flight to be answered.
+
+        Returns:
+            bool: True if every upload finished within the timeout
+        """
+        with self.condition:
+            self.closing = True
+            return self.condition.wait_for(lambda: self.in_flight == 0, timeout)
+
+    def shutdown(self):
+        """Stop the workers and remove the temporary upload folder, if one was created."""
+        self.close(timeout=0)
+        self.executor.shutdown(wait=True)
+        if self.owns_upload_dir:
+            shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+def job_to_dict(job):
+    """Return the public view of a stored job."""
+    return {
+        'id': job['id'],
+        'status': job['status'],
+        'filename': job['filename'],
+        'text': job['text'],
+        'done': job['done'],
+        'total': job['total'],
+        'error': job['error'],
+        'seq': job['seq'],
+    }
+
+def create_app(workers, job_queue=None, max_upload_mb=200, max_queued=100):
+    """
+    Create the Flask app for the upload page and the transcription endpoints.
+
+    Args:
+        workers (TranscriptionWorkers): Pool that runs the transcriptions
+        job_queue (JobQueue, optional): Background queue behind the /jobs endpoints
+        max_upload_mb (float): Largest accepted upload; bigger ones get a 413
+        max_queued (int): Jobs queued or running before new ones get a 429
+
+    Returns:
+        flask.Flask: The application
+    """
+    # Flask is only needed for the web service
+    from flask import Flask, Request, Response, g, jsonify, render_template, request, stream_with_context
+    from werkzeug.exceptions import HTTPException
+
+    class UploadRequest(Request):
+        """A request that spools uploaded files straight to disk instead of memory."""
+
+        def _get_file_stream(self, total_content_length, content_type, filename=None,
+                             content_length=None):
+            """Write each uploaded file to its own file in the upload folder."""
+            suffix = os.path.splitext(filename or '')[1].lower()
+            stream = tempfile.NamedTemporaryFile(
+                'wb+', dir=workers.upload_dir, suffix=suffix, delete=False
+            )
+            g.setdefault('spooled', []).append(stream)
+            return stream
+
+    app = Flask(__name__, template_folder=TEMPLATE_DIR, static_folder=STATIC_DIR)
+    app.request_class = UploadRequest
+    app.config['MAX_CONTENT_LENGTH'] = int(max_upload_mb * 1024 * 1024)
+
+    @app.route('/')
+    def index():
+        return render_template('index.html')
+
+    @app.route('/status')
+    def status():
+        status = workers.status()
+        if job_queue is not None:
+            status['jobs_pending'] = job_queue.pending_count()
+        return jsonify(status)
+
+    def busy_response(message):
+        """Answer 429 with a hint for when to retry."""
+        response = jsonify(error=message)
+        response.headers['Retry-After'] = str(RETRY_AFTER)
+        return response, 429
+
+    def read_upload():
+        """Return the spooled upload, or an error response if it is missing or not audio."""
+        upload = request.files.get('file')
+        if upload is None or not upload.filename:
+            return None, (jsonify(error="No audio file uploaded"), 400)
+        if not upload.filename.lower().endswith(AUDIO_EXTENSIONS):
+            return None, (jsonify(error=f"Unsupported file type: {upload.filename}"), 415)
+        upload.stream.flush()
+        return upload, None
+
+    @app.route('/transcribe', methods=['POST'])
+    def transcribe():
+        # Check for room before reading the body, so a full server doesn't spool it
+        if not workers.acquire():
+            if workers.closing:
+                return jsonify(error="The server is shutting down"), 503
+            return busy_response("Too many transcriptions in progress, try again shortly")
+
+        try:
+            upload, error = read_upload()
+            if error:
+                return error
+            language = request.form.get('language') or None
+            text = workers.submit(upload.stream.name, language=language).result()
+            return jsonify(text=text)
+        except HTTPException:
+            raise
+        except Exception as e:
+            print(f"Error transcribing upload: {e}")
+            return jsonify(error=str(e)), 502
+        finally:
+            workers.release()
+
+    @app.route('/jobs', methods=['POST'])
+    def create_job():
+        if job_queue is None:
+            return jsonify(error="Background jobs are not enabled"), 404
+        if job_queue.pending_count() >= max_queued:
+            return busy_response("Too many jobs queued, try again shortly")
+        # The slot only covers spooling the upload; the job itself runs in the background
+        if not workers.acquire():
+            if workers.closing:
+                return jsonify(error="The server is shutting down"), 503
+            return busy_response("Too many uploads in progress, try again shortly")
+
+        try:
+            upload, error = read_upload()
+            if error:
+                return error
+            upload.stream.close()
+            job = job_queue.submit(
+                upload.stream.name, upload.filename, language=request.form.get('language') or None
+            )
+        finally:
+            workers.release()
+
+        response = jsonify(job_to_dict(job))
+        response.headers['Location'] = f"/jobs/{job['id']}"
+        return response, 202
+
+    @app.route('/jobs/<job_id>')
+    def get_job(job_id):
+        if job_queue is None:
+            return jsonify(error="Background jobs are not enabled"), 404
+        # Long-poll: with ?seq=N, wait until the job moves past update N
+        seq = request.args.get('seq', type=int)
+        if seq is None:
+            job = job_queue.get(job_id)
+        else:
+            job = job_queue.wait(job_id, seq, timeout=POLL_TIMEOUT)
+        if job is None:
+            return jsonify(error="No such job"), 404
+        return jsonify(job_to_dict(job))
+
+    @app.route('/jobs/<job_id>/events')
+    def job_events(job_id):
+        if job_queue is None:
+            return jsonify(error="Background jobs are not enabled"), 404
+        job = job_queue.get(job_id)
+        if job is None:
+            return jsonify(error="No such job"), 404
+
+        def events(job):
+            """Send the job's state, then every change to it, until it finishes."""
+            while True:
+                yield f"id: {job['seq']}\nevent: {job['status']}\ndata: {json.dumps(job_to_dict(job))}\n\n"
+                if job['status'] in FINAL_STATES:
+                    return
+                seq = job['seq']
+                while job['seq'] == seq:
+                    if job_queue.closing:
+                        return
+                    job = job_queue.wait(job_id, seq, timeout=POLL_TIMEOUT)
+                    if job is None:
+                        return
+                    if job['seq'] == seq:
+                        # Keeps proxies from closing a quiet connection
+                        yield ": ping\n\n"
+
+        return Response(
+            stream_with_context(events(job)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @app.teardown_request
+    def remove_spooled_files(error=None):
+        # Closed first, since an open file can't be removed on Windows
+        for stream in g.pop('spooled', []):
+            try:
+                stream.close()
+                os.remove(stream.name)
+            except FileNotFoundError:
+                # Moved into the job queue
+                pass
+            except OSError as e:
+                print(f"Error removing upload {stream.name}: {e}")
+
+    return app
+
+def serve(app, workers, job_queue=None, host='127.0.0.1', port=8000, drain_timeout=300.0):
+    """
+    Serve until interrupted, then finish the uploads in flight before exiting.
+
+    Args:
+        app (flask.Flask): The application from create_app()
+        workers (TranscriptionWorkers): The app's worker pool
+        job_queue (JobQueue, optional): The app's background queue; running jobs
+            get the same drain timeout and otherwise restart with the server
+        host (str): Interface to listen on
+        port (int): Port to listen on
+        drain_timeout (float): Longest wait for uploads in flight at shutdown
+    """
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, app, threaded=True)
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    thread = threading.Thread(target=server.serve_forever, name="web-server", daemon=True)
+    thread.start()
+    print(f"Serving on http://{host}:{server.port} with {workers.workers} workers")
+
+    try:
+        # Wake up regularly so signals are handled promptly on every platform
+        while not stop.wait(0.5):
+            pass
+    finally:
+        # New uploads are refused with a 503 while the ones in flight finish
+        print("Shutting down, waiting for transcriptions in progress...")
+        deadline = time.monotonic() + drain_timeout
+        if not workers.close(timeout=drain_timeout):
+            print("Gave up waiting for transcriptions in progress")
+        if job_queue is not None and not job_queue.close(timeout=max(0.0, deadline - time.monotonic())):
+            print("Jobs still running will start over when the server is restarted")
+        server.shutdown()
+        thread.join()
+        workers.shutdown()
+
+def main(argv=None):
+    """Run the web service. Returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog='python -m speech_to_text serve',
+        description='Serve the upload page and a transcription endpoint over HTTP.'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='interface to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on (default: 8000)')
+    parser.add_argument('-j', '--workers', type=int, default=2, help='files transcribed at once (default: 2)')
+    parser.add_argument('--max-in-flight', type=int, default=8,
+                        help='uploads accepted at once before answering 429 (default: 8)')
+    parser.add_argument('--max-upload-mb', type=float, default=200, help='largest accepted upload (default: 200)')
+    parser.add_argument('--upload-dir', help='where uploads are spooled (default: a temporary folder)')
+    parser.add_argument('--drain-timeout', type=float, default=300,
+                        help='seconds to wait for transcriptions in progress at shutdown (default: 300)')
+    parser.add_argument('--job-workers', type=int, default=2,
+                        help='background jobs transcribed at once (default: 2)')
+    parser.add_argument('--max-queued', type=int, default=100,
+                        help='background jobs queued before answering 429 (default: 100)')
+    parser.add_argument('--jobs-db', help='job queue database (default: ~/.speechtotext/jobs.sqlite3)')
+    parser.add_argument('--no-cache', action='store_true', help='always upload, ignoring cached results')
+    args = parser.parse_args(argv)
+
+    try:
+        import flask  # noqa: F401
+    except ImportError:
+        print('The web service needs Flask: uv pip install -e ".[web]"')
+        return 1
+
+    # Same engine and network settings as the tray app and batch runs
+    try:
+        service = create_file_service(use_cache=not args.no_cache)
+    except ValueError as e:
+        print(f"Configuration error: {e}")
+        return 1
+    workers = TranscriptionWorkers(
+        service,
+        workers=max(1, args.workers if service.engine.thread_safe else 1),
+        max_in_flight=max(1, args.max_in_flight),
+        upload_dir=args.upload_dir
+    )
+    job_queue = JobQueue(
+        JobStore(args.jobs_db),
+        ChunkedTranscriber(service, max_workers=2),
+        workers=max(1, args.job_workers if service.engine.thread_safe else 1)
+    )
+    job_queue.start()
+
+    app = create_app(
+        workers, job_queue, max_upload_mb=args.max_upload_mb, max_queued=max(1, args.max_queued)
+    )
+    serve(app, workers, job_queue, host=args.host, port=args.port, drain_timeout=args.drain_timeout)
+    return 0
@@ -0,0 +1,136 @@
+// Upload page for the Speech to Text web service
+
+const dropArea = document.getElementById('drop-area');
+const fileInput = document.getElementById('fileElem');
+const fileInfo = document.getElementById('file-info');
+const fileName = document.getElementById('file-name');
+const removeButton = document.getElementById('remove-file');
+const transcribeButton = document.getElementById('transcribe-btn');
+const resultContainer = document.getElementById('result-container');
+const loader = document.getElementById('loader');
+const result = document.getElementById('transcription-result');
+const copyButton = document.getElementById('copy-btn');
+const downloadButton = document.getElementById('download-btn');
+
+let selectedFile = null;
+let busy = false;
+
+function selectFile(file) {
+    selectedFile = file || null;
+    if (selectedFile) {
+        fileName.textContent = selectedFile.name;
+        fileInfo.classList.remove('hidden');
+    } else {
+        fileInput.value = '';
+        fileInfo.classList.add('hidden');
+    }
+    updateButton();
+}
+
+function updateButton() {
+    transcribeButton.classList.toggle('disabled', !selectedFile || busy);
+}
+
+['dragenter', 'dragover'].forEach(name => {
+    dropArea.addEventListener(name, event => {
+        event.preventDefault();
+        dropArea.classList.add('highlight');
+    });
+});
+
+['dragleave', 'drop'].forEach(name => {
+    dropArea.addEventListener(name, event => {
+        event.preventDefault();
+        dropArea.classList.remove('highlight');
+    });
+});
+
+dropArea.addEventListener('drop', event => selectFile(event.dataTransfer.files[0]));
+fileInput.addEventListener('change', () => selectFile(fileInput.files[0]));
+removeButton.addEventListener('click', () => selectFile(null));
+
+function finish() {
+    busy = false;
+    loader.classList.add('hidden');
+    updateButton();
+}
+
+function showProgress(job) {
+    if (job.status === 'failed') {
+        result.textContent = `Error: ${job.error}`;
+    } else if (job.status === 'queued') {
+        result.textContent = 'Waiting for a free worker...';
+    } else if (job.status === 'running' && !job.text) {
+        result.textContent = job.total ? `Transcribing... 0/${job.total} chunks done` : 'Transcribing...';
+    } else {
+        result.textContent = job.text;
+    }
+}
+
+// Follow a job's progress; the partial text is shown as chunks finish
+function follow(job) {
+    showProgress(job);
+    const events = new EventSource(`/jobs/${job.id}/events`);
+    const update = event => {
+        const latest = JSON.parse(event.data);
+        showProgress(latest);
+        if (latest.status === 'done' || latest.status === 'failed') {
+            events.close();
+            finish();
+        }
+    };
+    ['queued', 'running', 'done', 'failed'].forEach(name => events.addEventListener(name, update));
+    events.onerror = () => {
+        // The browser reconnects by itself unless the server has closed for good
+        if (events.readyState === EventSource.CLOSED) {
+            finish();
+        }
+    };
+}
+
+async function transcribe() {
+    if (!selectedFile || busy) {
+        return;
+    }
+    busy = true;
+    updateButton();
+    resultContainer.classList.remove('hidden');
+    loader.classList.remove('hidden');
+    result.textContent = '';
+
+    const form = new FormData();
+    form.append('file', selectedFile);
+
+    try {
+        const response = await fetch('/jobs', { method: 'POST', body: form });
+        const data = await response.json().catch(() => ({}));
+        if (response.ok) {
+            follow(data);
+            return;
+        }
+        if (response.status === 429) {
+            const wait = response.headers.get('Retry-After') || 'a few';
+            result.textContent = `The server is busy. Try again in ${wait} seconds.`;
+        } else {
+            result.textContent = `Error: ${data.error || response.statusText}`;
+        }
+    } catch (error) {
+        result.textContent = `Error: ${error.message}`;
+    }
+    finish();
+}
+
+transcribeButton.addEventListener('click', transcribe);
+
+copyButton.addEventListener('click', () => {
+    navigator.clipboard.writeText(result.textContent);
+});
+
+downloadButton.addEventListener('click', () => {
+    const blob = new Blob([result.textContent], { type: 'text/plain' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = (selectedFile ? selectedFile.name.replace(/\.[^.]+$/, '') : 'transcription') + '.txt';
+    link.click();
+    URL.revokeObjectURL(link.href);
+});